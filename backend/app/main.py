@@ -1,8 +1,20 @@
 from __future__ import annotations
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
 from app.config.settings import settings
+from app.infrastructure.paths import get_paths
+from app.modules.hybrid.services.nli_worker import stop_nli_worker
+from app.modules.hybrid.services.warmup import readiness, start_preload
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    start_preload(get_paths())
+    yield
+    stop_nli_worker()
 
 
 def create_app() -> FastAPI:
@@ -10,6 +22,7 @@ def create_app() -> FastAPI:
         title="HI Decision Support API",
         version="1.0.0",
         description="Surface helper pipeline insights to the frontend.",
+        lifespan=_lifespan,
     )
     _configure_cors(app)
     _register_routes(app)
@@ -37,8 +50,11 @@ def _register_healthcheck(app: FastAPI) -> None:
         return {"status": "ok"}
 
     @app.get("/ready", tags=["system"])
-    def ready() -> dict[str, str]:
-        return {"status": "ready"}
+    def ready(response: Response) -> dict:
+        is_ready, payload = readiness()
+        if not is_ready:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return payload
 
 
 app = create_app()
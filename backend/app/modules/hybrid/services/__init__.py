@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 __all__ = [
+    "nli_worker",
     "pairs",
     "pipeline",
     "scoring",
     "strategy_input",
+    "warmup",
     "workflow_state",
 ]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlparse
+from fastapi import HTTPException, status
+from app.infrastructure.paths import BackendPaths
+
+DEFAULT_WORKER_URL = "http://127.0.0.1:8765"
+
+_WORKER_PROCESS: subprocess.Popen | None = None
+
+_WORKER_LOCK = threading.Lock()
+
+
+def nli_worker_enabled() -> bool:
+    return os.getenv("NLI_BACKEND", "local").strip().lower() == "remote"
+
+
+def nli_worker_url() -> str:
+    return os.getenv("NLI_WORKER_URL", DEFAULT_WORKER_URL).rstrip("/")
+
+
+def nli_worker_health(timeout: float = 2.0) -> dict | None:
+    try:
+        with urllib.request.urlopen(
+            f"{nli_worker_url()}/health", timeout=timeout
+        ) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+
+def _spawn_worker(paths: BackendPaths) -> subprocess.Popen:
+    parsed = urlparse(nli_worker_url())
+    if parsed.hostname not in {"127.0.0.1", "localhost"}:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"NLI worker unreachable at {nli_worker_url()}",
+        )
+    script_path = paths.pipeline_root / "4-PremisePairs" / "nli_worker.py"
+    if not script_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"NLI worker script not found: {script_path}",
+        )
+    log_dir = paths.workdir_root / "pipeline-reports"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    worker_backend = os.getenv("NLI_WORKER_BACKEND", "local").strip().lower()
+    env = {**os.environ, "NLI_BACKEND": worker_backend}
+    with open(log_dir / "nli_worker.log", "a", encoding="utf-8") as log_file:
+        return subprocess.Popen(
+            [
+                sys.executable,
+                str(script_path),
+                "--host",
+                parsed.hostname,
+                "--port",
+                str(parsed.port or 80),
+                "--backend",
+                worker_backend,
+            ],
+            cwd=str(paths.pipeline_root),
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+
+
+def ensure_nli_worker(paths: BackendPaths, timeout_seconds: int = 180) -> None:
+    global _WORKER_PROCESS
+    if not nli_worker_enabled():
+        return
+    with _WORKER_LOCK:
+        if nli_worker_health() is not None:
+            return
+        if _WORKER_PROCESS is None or _WORKER_PROCESS.poll() is not None:
+            _WORKER_PROCESS = _spawn_worker(paths)
+        deadline = time.time() + timeout_seconds
+        while time.time() < deadline:
+            if _WORKER_PROCESS.poll() is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"NLI worker exited with code {_WORKER_PROCESS.returncode}",
+                )
+            if nli_worker_health() is not None:
+                return
+            time.sleep(0.5)
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"NLI worker did not become ready within {timeout_seconds}s",
+    )
+
+
+def stop_nli_worker() -> None:
+    global _WORKER_PROCESS
+    with _WORKER_LOCK:
+        if _WORKER_PROCESS is not None and _WORKER_PROCESS.poll() is None:
+            _WORKER_PROCESS.terminate()
+            try:
+                _WORKER_PROCESS.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                _WORKER_PROCESS.kill()
+        _WORKER_PROCESS = None
+
+
+__all__ = [
+    "ensure_nli_worker",
+    "nli_worker_enabled",
+    "nli_worker_health",
+    "stop_nli_worker",
+]
@@ -14,6 +14,7 @@ from app.infrastructure.presets import (
     persist_preset_pairs,
 )
 
+from app.modules.hybrid.services.nli_worker import ensure_nli_worker
 from app.modules.hybrid.services.scoring import (
     run_calibration_script,
     run_scoring_script,
@@ -25,6 +26,15 @@ from app.modules.hybrid.services.workflow_state import (
     load_selected_strategy_id,
 )
 
+STAGE_TIMEOUT_SECONDS = 300
+
+NLI_DEADLINE_MARGIN_SECONDS = 20
+
+
+def stage_env(timeout_seconds: int) -> dict[str, str]:
+    deadline_at = time.time() + max(0, timeout_seconds - NLI_DEADLINE_MARGIN_SECONDS)
+    return {**os.environ, "NLI_DEADLINE_AT": f"{deadline_at:.3f}"}
+
 
 def load_historical_timings(paths: BackendPaths) -> dict[str, float]:
     try:
@@ -202,7 +212,7 @@ def run_pipeline_script(
     stage_dir: str,
     script_name: str,
     stage_label: str,
-    timeout_seconds: int = 300,
+    timeout_seconds: int = STAGE_TIMEOUT_SECONDS,
 ) -> None:
     script_path = paths.pipeline_root / stage_dir / script_name
     if not script_path.exists():
@@ -216,6 +226,7 @@ def run_pipeline_script(
         capture_output=True,
         text=True,
         timeout=timeout_seconds,
+        env=stage_env(timeout_seconds),
     )
     if result.returncode != 0:
         error_msg = result.stderr if result.stderr else result.stdout
@@ -371,6 +382,7 @@ def run_pipeline(paths: BackendPaths) -> dict:
                 ),
             )
         require_preprocessing_artifacts(paths)
+        ensure_nli_worker(paths)
         stages = _build_default_stages()
         total_estimated_duration = sum(
             historical_timings.get(stage_dir, 30.0) for stage_dir, _, _ in stages
@@ -415,7 +427,8 @@ def run_pipeline(paths: BackendPaths) -> dict:
                 cwd=str(paths.pipeline_root),
                 capture_output=True,
                 text=True,
-                timeout=300,
+                timeout=STAGE_TIMEOUT_SECONDS,
+                env=stage_env(STAGE_TIMEOUT_SECONDS),
             )
             if result.returncode != 0:
                 error_msg = result.stderr if result.stderr else result.stdout
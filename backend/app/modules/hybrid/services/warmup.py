@@ -0,0 +1,164 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+from app.infrastructure.paths import BackendPaths
+from app.modules.hybrid.services.nli_worker import ensure_nli_worker, nli_worker_enabled
+
+DEFAULT_NLI_MODEL = "microsoft/deberta-large-mnli"
+
+APP_ROOT = Path(__file__).resolve().parents[3]
+
+NLI_EXPORTS_PATH = APP_ROOT / "pipelines" / "nli" / "pipeline" / "nli_exports.py"
+
+_NLI_EXPORTS_MODULE_NAME = "nli_exports"
+
+READ_CHUNK_BYTES = 8 * 1024 * 1024
+
+_STATE_LOCK = threading.Lock()
+
+_COMPONENTS: dict[str, dict[str, Any]] = {}
+
+_PRELOAD_THREAD: threading.Thread | None = None
+
+
+def preload_enabled() -> bool:
+    return os.getenv("NLI_PRELOAD", "false").strip().lower() in {"1", "true", "yes"}
+
+
+def _set_component(name: str, **fields: Any) -> None:
+    with _STATE_LOCK:
+        _COMPONENTS.setdefault(name, {}).update(fields)
+
+
+def _touch_file(file: Path) -> int:
+    total = 0
+    with file.open("rb") as handle:
+        while chunk := handle.read(READ_CHUNK_BYTES):
+            total += len(chunk)
+    return total
+
+
+def _load_nli_exports() -> ModuleType:
+    spec = spec_from_file_location(_NLI_EXPORTS_MODULE_NAME, NLI_EXPORTS_PATH)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load spec for {_NLI_EXPORTS_MODULE_NAME}")
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _fetch_model_files(model_name: str) -> Path:
+    from transformers import AutoConfig, AutoTokenizer
+    from transformers.utils import SAFE_WEIGHTS_NAME, WEIGHTS_NAME, cached_file
+
+    AutoConfig.from_pretrained(model_name)
+    AutoTokenizer.from_pretrained(model_name)
+    for weights_name in (SAFE_WEIGHTS_NAME, WEIGHTS_NAME):
+        weights = cached_file(
+            model_name, weights_name, _raise_exceptions_for_missing_entries=False
+        )
+        if weights:
+            return Path(weights)
+    raise FileNotFoundError(f"No model weights found for {model_name}")
+
+
+def _warm_nli_model(paths: BackendPaths) -> dict[str, Any]:
+    if nli_worker_enabled():
+        ensure_nli_worker(paths)
+        return {"mode": "remote-worker"}
+    backend = os.getenv("NLI_BACKEND", "local").strip().lower()
+    model_name = os.getenv("NLI_MODEL_NAME", DEFAULT_NLI_MODEL)
+    if backend in {"onnx", "int8"}:
+        model_file = _load_nli_exports().export_model_file(
+            backend, model_name, paths.data_root / "nli-models"
+        )
+        if not model_file.exists():
+            raise FileNotFoundError(f"NLI export missing: {model_file}")
+        return {
+            "mode": "page-cache",
+            "backend": backend,
+            "file": str(model_file),
+            "bytes": _touch_file(model_file),
+        }
+    weights = _fetch_model_files(model_name)
+    return {
+        "mode": "hf-cache",
+        "backend": backend,
+        "weights": str(weights),
+        "bytes": weights.stat().st_size,
+    }
+
+
+def _file_warmer(file: Path) -> Callable[[BackendPaths], dict]:
+    def warm(_: BackendPaths) -> dict[str, Any]:
+        return {"mode": "page-cache", "file": str(file), "bytes": _touch_file(file)}
+
+    return warm
+
+
+def _loaders(paths: BackendPaths) -> dict[str, Callable[[BackendPaths], dict]]:
+    return {
+        "nli_model": _warm_nli_model,
+        "forecast_index": _file_warmer(paths.forecast_index_file),
+        "risk_index": _file_warmer(paths.risk_index_file),
+        "premises": _file_warmer(paths.embeddings_index_dir / "premises_meta.parquet"),
+    }
+
+
+def _run_preload(paths: BackendPaths) -> None:
+    for name, loader in _loaders(paths).items():
+        _set_component(name, status="loading")
+        start = time.perf_counter()
+        try:
+            details = loader(paths)
+        except Exception as exc:
+            _set_component(
+                name,
+                status="failed",
+                seconds=round(time.perf_counter() - start, 3),
+                error=str(getattr(exc, "detail", exc)),
+            )
+            continue
+        _set_component(
+            name,
+            status="warm",
+            seconds=round(time.perf_counter() - start, 3),
+            **details,
+        )
+
+
+def start_preload(paths: BackendPaths) -> None:
+    global _PRELOAD_THREAD
+    if not preload_enabled() or _PRELOAD_THREAD is not None:
+        return
+    for name in _loaders(paths):
+        _set_component(name, status="pending")
+    _PRELOAD_THREAD = threading.Thread(
+        target=_run_preload, args=(paths,), name="nli-preload", daemon=True
+    )
+    _PRELOAD_THREAD.start()
+
+
+def readiness() -> tuple[bool, dict[str, Any]]:
+    with _STATE_LOCK:
+        components = {name: dict(state) for name, state in _COMPONENTS.items()}
+    statuses = {state.get("status") for state in components.values()}
+    if statuses & {"pending", "loading"}:
+        status = "warming"
+    elif "failed" in statuses:
+        status = "degraded"
+    else:
+        status = "ready"
+    return status != "warming", {
+        "status": status,
+        "preload": preload_enabled(),
+        "components": components,
+    }
+
+
+__all__ = ["preload_enabled", "readiness", "start_preload"]
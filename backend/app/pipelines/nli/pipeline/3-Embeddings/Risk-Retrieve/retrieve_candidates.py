@@ -3,17 +3,12 @@ import json
 import sys
 from pathlib import Path
 from typing import List, Set, Dict, Any
-from os import getenv
-import faiss
 import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
-from openai import OpenAI
 
 load_dotenv()
 
-client = OpenAI(api_key=getenv("OPENAI_API_KEY"), timeout=10)
-
 BASE_DIR = Path(__file__).resolve().parent
 
 STAGE_DIR = BASE_DIR.parent
@@ -22,7 +17,12 @@ PIPELINE_ROOT = STAGE_DIR.parent
 
 sys.path.insert(0, str(PIPELINE_ROOT))
 
+from embedding_providers import get_embedding_provider
 from paths import PipelinePaths
+from query_embeddings import embed_hypotheses
+from retrieval_filters import compatible_mask
+from vector_registry import LoadedCollection, get_registry
+from vector_store import filter_labels
 
 PATHS = PipelinePaths.from_file(Path(__file__))
 
@@ -34,6 +34,8 @@ INDEX_DIR = PATHS.embeddings_index_dir
 
 INDEX_FILE = INDEX_DIR / "risks.faiss"
 
+COLLECTION = "risks"
+
 META_FILE = INDEX_DIR / "risks_meta.parquet"
 
 OUTPUT_DIR = PATHS.risk_retrieve_out_dir
@@ -48,7 +50,7 @@ TEXT_COL = "nli"
 
 ID_COL = "risk_id"
 
-EMBEDDING_MODEL = "text-embedding-3-small"
+embedder = get_embedding_provider(timeout=10)
 
 TOP_K = 5
 
@@ -77,31 +79,18 @@ def load_strategy_payload(path: Path) -> Dict[str, Any]:
     return payload
 
 
-def load_index() -> tuple[faiss.Index, pd.DataFrame]:
+def load_index() -> LoadedCollection:
     if not INDEX_FILE.exists() or not META_FILE.exists():
         raise FileNotFoundError(
             "Index oder Meta fehlen. Lauf zuerst preprocessing/embeddings/build_risk_index.py."
         )
-    index = faiss.read_index(str(INDEX_FILE))
-    meta = pd.read_parquet(META_FILE)
+    collection = get_registry().get(COLLECTION)
+    meta = collection.meta
     if ID_COL not in meta.columns or TEXT_COL not in meta.columns:
         raise ValueError(
             f"Meta-Datei {META_FILE} braucht Spalten '{ID_COL}' und '{TEXT_COL}'."
         )
-    return index, meta
-
-
-def embed_query(text: str) -> np.ndarray:
-    try:
-        resp = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=text,
-        )
-    except Exception as exc:
-        raise RuntimeError(f"OpenAI embedding request failed: {exc}") from exc
-    vec = np.array(resp.data[0].embedding, dtype="float32")
-    vec = vec / (np.linalg.norm(vec) + 1e-12)
-    return vec.reshape(1, -1)
+    return collection
 
 
 def _write_empty_outputs(meta: pd.DataFrame | None, reason: str) -> None:
@@ -115,8 +104,9 @@ def _write_empty_outputs(meta: pd.DataFrame | None, reason: str) -> None:
 
 
 def main() -> None:
-    if not getenv("OPENAI_API_KEY"):
-        _write_empty_outputs(meta=None, reason="OPENAI_API_KEY missing")
+    reason = embedder.unavailable_reason()
+    if reason:
+        _write_empty_outputs(meta=None, reason=reason)
         return
     print(f"➡️ Lade Strategy + Hypothesen aus {STRATEGY_WITH_HYPOTHESES}")
     strategy_payload = load_strategy_payload(STRATEGY_WITH_HYPOTHESES)
@@ -127,22 +117,25 @@ def main() -> None:
     strategy_raw = strategy_payload.get("raw", "")
     strategy_title = strategy_payload.get("strategy_title", "")
     print("➡️ Lade Risk-Embedding-Index …")
-    index, meta = load_index()
+    collection = load_index()
+    meta = collection.meta
+    mask = compatible_mask(meta, strategy_payload)
+    labels = None if mask is None else filter_labels(meta, mask)
+    if mask is not None:
+        print(f"ℹ️ Region/Segment-Filter: {int(mask.sum())}/{len(meta)} kompatibel.")
     all_ids: Set[str] = set()
     records: List[Dict[str, Any]] = []
     similarity_by_id: Dict[str, float] = {}
     try:
+        q_embs = embed_hypotheses(embedder, hypotheses)
+        print(f"➡️ Suche Top-{TOP_K} für {len(hypotheses)} Hypothesen …")
+        all_scores, all_idx = collection.search(q_embs, TOP_K, labels)
         for hyp_idx, hyp in enumerate(hypotheses):
-            if not hyp:
-                continue
-            print(f"➡️ Embedding & Suche für Hypothese {hyp_idx}: {hyp!r}")
-            q_emb = embed_query(hyp)
-            scores, idx = index.search(q_emb, TOP_K)
-            scores = scores[0]
-            idx = idx[0]
+            scores = all_scores[hyp_idx]
+            idx = all_idx[hyp_idx]
             order = np.argsort(scores)[::-1]
             for rank_pos, pos in enumerate(order, start=1):
-                row_idx = idx[pos]
+                row_idx = int(idx[pos])
                 if row_idx < 0:
                     continue
                 score = float(scores[pos])
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import argparse
+import json
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Dict, List
+import faiss
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PIPELINE_ROOT = BASE_DIR.parent
+
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+from embedding_providers import normalize_rows
+from paths import PipelinePaths
+from vector_store import build_ann_index, configure_search, factory_string
+
+PATHS = PipelinePaths.from_file(Path(__file__))
+
+OUTPUT_DIR = PATHS.pipeline_reports_dir / "index-benchmark"
+
+DEFAULT_SIZES = "10000,100000,1000000"
+
+DEFAULT_SPECS = "flat,ivf,hnsw,ivfpq,sq8"
+
+DEFAULT_DIMS = 384
+
+DEFAULT_QUERIES = 200
+
+RECALL_K = 5
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _str_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def synthetic_corpus(
+    count: int, dims: int, queries: int, seed: int = 13
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(16, count // 1000), dims), dtype=np.float32)
+    corpus = np.empty((count, dims), dtype=np.float32)
+    for start in range(0, count, 100_000):
+        stop = min(count, start + 100_000)
+        assign = rng.integers(0, len(centers), stop - start)
+        noise = rng.standard_normal((stop - start, dims), dtype=np.float32)
+        corpus[start:stop] = normalize_rows(centers[assign] + 0.6 * noise)
+    picks = rng.integers(0, count, queries)
+    noise = rng.standard_normal((queries, dims), dtype=np.float32)
+    return corpus, normalize_rows(corpus[picks] + 0.3 * noise)
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(row) & set(ref)) for row, ref in zip(found, truth))
+    return hits / truth.size
+
+
+def bench_spec(
+    spec: str, corpus: np.ndarray, queries: np.ndarray, truth: np.ndarray
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    index = build_ann_index(corpus, spec)
+    index.add(corpus)
+    build_seconds = time.perf_counter() - start
+    configure_search(index)
+    latencies: List[float] = []
+    found = np.empty_like(truth)
+    for row, query in enumerate(queries):
+        start = time.perf_counter()
+        _, labels = index.search(query[None, :], RECALL_K)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found[row] = labels[0]
+    return {
+        "spec": spec,
+        "factory": factory_string(spec, len(corpus), corpus.shape[1]),
+        "build_seconds": build_seconds,
+        "recall_at_5": _recall(found, truth),
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p95_ms": float(np.percentile(latencies, 95)),
+        "memory_mb": len(faiss.serialize_index(index)) / 1024 / 1024,
+    }
+
+
+def run_benchmark(
+    sizes: List[int], specs: List[str], dims: int, query_count: int
+) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for count in sizes:
+        print(f"➡️ Synthetischer Korpus: {count} Vektoren · {dims} Dimensionen …")
+        corpus, queries = synthetic_corpus(count, dims, query_count)
+        baseline = faiss.IndexFlatIP(dims)
+        baseline.add(corpus)
+        _, truth = baseline.search(queries, RECALL_K)
+        del baseline
+        for spec in specs:
+            result = {"corpus_size": count, **bench_spec(spec, corpus, queries, truth)}
+            results.append(result)
+            print(
+                f"ℹ️ n={count} {spec} ({result['factory']}): "
+                f"recall@5 {result['recall_at_5']:.3f}, "
+                f"p50 {result['latency_p50_ms']:.2f} ms, "
+                f"p95 {result['latency_p95_ms']:.2f} ms, "
+                f"{result['memory_mb']:.1f} MB, Build {result['build_seconds']:.1f}s"
+            )
+    return {
+        "created_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        "dims": dims,
+        "queries": query_count,
+        "faiss_threads": faiss.omp_get_max_threads(),
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark FAISS index specs: recall@5 vs. flat, latency, memory"
+    )
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--specs", default=DEFAULT_SPECS)
+    parser.add_argument("--dims", type=int, default=DEFAULT_DIMS)
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    result = run_benchmark(
+        _int_list(args.sizes), _str_list(args.specs), args.dims, args.queries
+    )
+    if args.output:
+        output_file = Path(args.output).resolve()
+    else:
+        stamp = result["created_at"].replace(":", "").replace("-", "")[:15]
+        output_file = OUTPUT_DIR / f"index-benchmark-{stamp}.json"
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"✅ Benchmark gespeichert → {output_file}")
+
+
+if __name__ == "__main__":
+    main()
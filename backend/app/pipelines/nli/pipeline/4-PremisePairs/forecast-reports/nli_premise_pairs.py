@@ -19,7 +19,16 @@ if str(PIPELINE_STAGE_DIR) not in sys.path:
 
 from pair_schema import create_forecast_pair, PairReport
 from paths import PipelinePaths
-from shared import NliScorer, get_nli_scorer, ts_utc
+from shared import (
+    UNSCORED_VERDICT,
+    Deadline,
+    NliScorer,
+    get_nli_scorer,
+    score_anytime,
+    surrogate_candidates,
+    ts_utc,
+    unscored_scores,
+)
 
 PATHS = PipelinePaths.from_file(Path(__file__))
 
@@ -33,6 +42,10 @@ ALL_RESULTS_FILE = OUTPUT_DIR / "premise_hypothesis_pairs.json"
 
 TOP_RESULTS_FILE = OUTPUT_DIR / "premise_hypothesis_top5.json"
 
+PREMISE_INDEX_FILE = PATHS.embeddings_index_dir / "premises.faiss"
+
+PREMISE_META_FILE = PATHS.embeddings_index_dir / "premises_meta.parquet"
+
 
 def _default_pdf_name(segment: str | None, region: str | None) -> str:
     seg = (segment or "unknown").strip().replace(" ", "")
@@ -80,60 +93,80 @@ def build_rows(
     premises: pd.DataFrame,
     nli_scorer: NliScorer,
     strategy_data: dict,
-) -> list[dict]:
+    deadline: Deadline,
+    candidates: dict[str, set] | None = None,
+) -> tuple[list[dict], dict]:
     rows: list[dict] = []
     strategy_title = strategy_data.get("strategy_title")
     strategy_segment = strategy_data.get("segment")
     strategy_region = strategy_data.get("region")
     strategy_focus = strategy_data.get("focus")
     strategy_direction = strategy_data.get("direction")
-    for hypothesis in hypotheses:
-        if not hypothesis.strip():
-            continue
-        for _, row in premises.iterrows():
-            premise_text = str(row["premise_text"])
-            scores = nli_scorer.score(premise_text, hypothesis)
-            ent = float(scores.get("ENTAILMENT", 0.0))
-            con = float(scores.get("CONTRADICTION", 0.0))
-            neu = float(scores.get("NEUTRAL", 0.0))
-            verdict = max(
-                [("ENTAIL", ent), ("CONTRADICT", con), ("NEUTRAL", neu)],
-                key=lambda pair: pair[1],
-            )[0]
-            retrieval_sim = _to_float(row.get("similarity"), 0.0)
-            combined_score = ent
-            pair = create_forecast_pair(
-                hypothesis=hypothesis,
-                premise_id=str(row.get("premise_id", "")),
-                premise_text=premise_text,
-                segment=row.get("segment"),
-                region=row.get("region"),
-                year=int(row["year"]) if not pd.isna(row["year"]) else None,
-                source=row.get("source"),
-                kind=row.get("kind"),
-                nli_target=row.get("nli_target"),
-                entailment=ent,
-                contradiction=con,
-                neutral=neu,
-                verdict=verdict,
-                quote=row.get("quote") or row.get("risk_text_quote"),
-                similarity=retrieval_sim,
-                combined_score=combined_score,
-                strategy_title=strategy_title,
-                strategy_segment=strategy_segment,
-                strategy_region=strategy_region,
-                strategy_focus=strategy_focus,
-                strategy_direction=strategy_direction,
-                model_name=nli_scorer.model_name,
-                pdf_name=row.get("pdf_name")
-                or _default_pdf_name(row.get("segment"), row.get("region")),
-                page=row.get("page") or 1,
-            )
-            rows.append(pair.to_dict())
-    return rows
+    premise_rows = [row for _, row in premises.iterrows()]
+    combos = [
+        (hypothesis, row)
+        for hypothesis in hypotheses
+        if hypothesis.strip()
+        for idx, row in enumerate(premise_rows)
+        if candidates is None or idx in candidates.get(hypothesis, ())
+    ]
+    batch_scores, anytime_stats = score_anytime(
+        nli_scorer,
+        [(str(row["premise_text"]), hypothesis) for hypothesis, row in combos],
+        [_to_float(row.get("similarity"), 0.0) for _, row in combos],
+        deadline,
+    )
+    for (hypothesis, row), scores in zip(combos, batch_scores):
+        scored = scores is not None
+        scores = scores if scored else unscored_scores()
+        premise_text = str(row["premise_text"])
+        ent = float(scores.get("ENTAILMENT", 0.0))
+        con = float(scores.get("CONTRADICTION", 0.0))
+        neu = float(scores.get("NEUTRAL", 0.0))
+        verdict = max(
+            [("ENTAIL", ent), ("CONTRADICT", con), ("NEUTRAL", neu)],
+            key=lambda pair: pair[1],
+        )[0]
+        if not scored:
+            verdict = UNSCORED_VERDICT
+        retrieval_sim = _to_float(row.get("similarity"), 0.0)
+        combined_score = ent
+        pair = create_forecast_pair(
+            hypothesis=hypothesis,
+            premise_id=str(row.get("premise_id", "")),
+            premise_text=premise_text,
+            segment=row.get("segment"),
+            region=row.get("region"),
+            year=int(row["year"]) if not pd.isna(row["year"]) else None,
+            source=row.get("source"),
+            kind=row.get("kind"),
+            nli_target=row.get("nli_target"),
+            entailment=ent,
+            contradiction=con,
+            neutral=neu,
+            verdict=verdict,
+            quote=row.get("quote") or row.get("risk_text_quote"),
+            similarity=retrieval_sim,
+            combined_score=combined_score,
+            strategy_title=strategy_title,
+            strategy_segment=strategy_segment,
+            strategy_region=strategy_region,
+            strategy_focus=strategy_focus,
+            strategy_direction=strategy_direction,
+            model_name=nli_scorer.model_name,
+            pdf_name=row.get("pdf_name")
+            or _default_pdf_name(row.get("segment"), row.get("region")),
+            page=row.get("page") or 1,
+        )
+        pair_dict = pair.to_dict()
+        if not scored:
+            pair_dict["nli_scored"] = False
+        rows.append(pair_dict)
+    return rows, anytime_stats
 
 
 def main() -> None:
+    deadline = Deadline.from_env()
     print(f"➡️ Loading strategy data from {STRATEGY_WITH_HYPOTHESES}")
     try:
         strategy_data = load_strategy_data()
@@ -153,8 +186,20 @@ def main() -> None:
         return
     nli_scorer = get_nli_scorer()
     print(f"➡️ NLI Backend: {nli_scorer.backend} ({nli_scorer.model_name})")
+    pretokenized = nli_scorer.load_premise_tokens(PATHS.merged_premises_file)
+    if pretokenized:
+        print(f"ℹ️ Loaded {pretokenized} pre-tokenized premises")
+    candidates, surrogate_stats = surrogate_candidates(
+        [hypothesis for hypothesis in hypotheses if hypothesis.strip()],
+        premises["premise_text"].astype(str).tolist(),
+        PREMISE_INDEX_FILE,
+        PREMISE_META_FILE,
+        "premise_text",
+    )
     print("➡️ Scoring hypothesis/premise combinations (this may take a moment)…")
-    rows = build_rows(hypotheses, premises, nli_scorer, strategy_data)
+    rows, anytime_stats = build_rows(
+        hypotheses, premises, nli_scorer, strategy_data, deadline, candidates
+    )
     unique_per_premise: dict[str, dict] = {}
     for row in rows:
         pid = row.get("premise_id")
@@ -183,6 +228,11 @@ def main() -> None:
         premise_count=len(premises),
         pair_count=len(rows_sorted),
         pairs=rows_sorted,
+        metadata={
+            "nli_stats": nli_scorer.stats(),
+            "nli_anytime": anytime_stats,
+            "nli_surrogate": surrogate_stats,
+        },
     )
     ALL_RESULTS_FILE.write_text(
         json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8"
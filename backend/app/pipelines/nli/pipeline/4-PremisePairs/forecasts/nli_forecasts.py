@@ -1,13 +1,11 @@
 from __future__ import annotations
 import json
 import sys
-from os import getenv
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Tuple
 import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
-from openai import OpenAI
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -22,8 +20,19 @@ if str(PIPELINE_ROOT) not in sys.path:
     sys.path.insert(0, str(PIPELINE_ROOT))
 
 from pair_schema import PairReport, create_forecast_pair
+from embedding_providers import get_embedding_provider
 from paths import PipelinePaths
-from shared import NliScorer, get_nli_scorer, ts_utc
+from query_embeddings import cached_embeddings
+from vector_store import IndexVectors
+from shared import (
+    UNSCORED_VERDICT,
+    Deadline,
+    NliScorer,
+    get_nli_scorer,
+    score_anytime,
+    ts_utc,
+    unscored_scores,
+)
 
 PATHS = PipelinePaths.from_file(Path(__file__))
 
@@ -35,26 +44,16 @@ OUTPUT_DIR = PATHS.forecast_reports_out_dir
 
 OUTPUT_FILE = OUTPUT_DIR / "forecast_pairs.json"
 
-EMBEDDING_MODEL = "text-embedding-3-small"
+PREMISE_INDEX_FILE = PATHS.embeddings_index_dir / "premises.faiss"
 
-DEFAULT_PAGE = 1
+PREMISE_META_FILE = PATHS.embeddings_index_dir / "premises_meta.parquet"
 
-load_dotenv()
 
-client = OpenAI(api_key=getenv("OPENAI_API_KEY"))
+DEFAULT_PAGE = 1
 
+load_dotenv()
 
-def _embed_texts(texts: List[str], batch_size: int = 64) -> np.ndarray:
-    vectors: List[np.ndarray] = []
-    for start in range(0, len(texts), batch_size):
-        end = start + batch_size
-        batch = texts[start:end]
-        resp = client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
-        for item in resp.data:
-            vectors.append(np.array(item.embedding, dtype="float32"))
-    emb = np.vstack(vectors)
-    norms = np.linalg.norm(emb, axis=1, keepdims=True) + 1e-12
-    return emb / norms
+embedder = get_embedding_provider()
 
 
 def load_forecasts() -> pd.DataFrame:
@@ -95,17 +94,37 @@ def load_strategy_data() -> dict:
     return payload
 
 
+def load_premise_vectors(premises: List[str], dim: int) -> np.ndarray:
+    vectors = np.zeros((len(premises), dim), dtype="float32")
+    found = np.zeros(len(premises), dtype=bool)
+    if PREMISE_INDEX_FILE.exists() and PREMISE_META_FILE.exists():
+        try:
+            stored = IndexVectors.from_index(
+                PREMISE_INDEX_FILE, PREMISE_META_FILE, "premise_text"
+            )
+            if stored.dim == dim and stored.model in {None, embedder.cache_key}:
+                vectors, found = stored.lookup(premises)
+        except Exception as exc:
+            print(f"⚠️ Index-Vektoren nicht lesbar ({exc}); embedde Forecasts neu.")
+    print(
+        f"ℹ️ {int(found.sum())}/{len(premises)} Forecast-Vektoren aus {PREMISE_INDEX_FILE.name}"
+    )
+    if not found.all():
+        missing = [text for text, hit in zip(premises, found) if not hit]
+        vectors[~found] = cached_embeddings(embedder, missing, 32)
+    return vectors
+
+
 def compute_similarity_matrix(hypotheses: List[str], premises: List[str]) -> np.ndarray:
     if not hypotheses or not premises:
         return np.zeros((len(hypotheses), len(premises)), dtype="float32")
-    if not getenv("OPENAI_API_KEY"):
-        print(
-            "⚠️ OPENAI_API_KEY missing for forecast similarity embeddings; using zeros."
-        )
+    reason = embedder.unavailable_reason()
+    if reason:
+        print(f"⚠️ {reason} for forecast similarity embeddings; using zeros.")
         return np.zeros((len(hypotheses), len(premises)), dtype="float32")
     try:
-        hyp_emb = _embed_texts(hypotheses, batch_size=32)
-        prem_emb = _embed_texts(premises, batch_size=32)
+        hyp_emb = cached_embeddings(embedder, hypotheses, 32)
+        prem_emb = load_premise_vectors(premises, hyp_emb.shape[1])
         return hyp_emb @ prem_emb.T
     except Exception as exc:
         print(f"⚠️ Embedding similarity failed ({exc}); using zeros.")
@@ -118,63 +137,81 @@ def build_pairs(
     nli_scorer: NliScorer,
     similarity_matrix: np.ndarray,
     strategy_data: dict,
-) -> List[dict]:
+    deadline: Deadline,
+) -> Tuple[List[dict], dict]:
     rows: List[dict] = []
     strategy_title = strategy_data.get("strategy_title")
     strategy_segment = strategy_data.get("segment")
     strategy_region = strategy_data.get("region")
     strategy_focus = strategy_data.get("focus")
     strategy_direction = strategy_data.get("direction")
-    for hyp_idx, hypothesis in enumerate(hypotheses):
-        if not str(hypothesis).strip():
-            continue
-        for prem_idx, (_, row) in enumerate(premises.iterrows()):
-            premise_text = str(row["premise_text"])
-            scores = nli_scorer.score(premise_text, hypothesis)
-            ent = float(scores.get("ENTAILMENT", 0.0))
-            con = float(scores.get("CONTRADICTION", 0.0))
-            neu = float(scores.get("NEUTRAL", 0.0))
-            verdict = max(
-                [("ENTAIL", ent), ("CONTRADICT", con), ("NEUTRAL", neu)],
-                key=lambda pair: pair[1],
-            )[0]
-            similarity = float(similarity_matrix[hyp_idx, prem_idx])
-            combined_score = ent
-            pair = create_forecast_pair(
-                hypothesis=hypothesis,
-                premise_id=str(row.get("premise_id", "")),
-                premise_text=premise_text,
-                quote=row.get("risk_text_quote") or row.get("quote"),
-                segment=row.get("segment"),
-                region=row.get("region"),
-                year=None,
-                source=row.get("pdf_filename") or row.get("source"),
-                kind=row.get("risk_type") or "forecast",
-                nli_target=None,
-                entailment=ent,
-                contradiction=con,
-                neutral=neu,
-                verdict=verdict,
-                similarity=similarity,
-                combined_score=combined_score,
-                pdf_name=row.get("pdf_filename"),
-                page=(
-                    int(row.get("page_start"))
-                    if not pd.isna(row.get("page_start"))
-                    else DEFAULT_PAGE
-                ),
-                strategy_title=strategy_title,
-                strategy_segment=strategy_segment,
-                strategy_region=strategy_region,
-                strategy_focus=strategy_focus,
-                strategy_direction=strategy_direction,
-                model_name=nli_scorer.model_name,
-            )
-            rows.append(pair.to_dict())
-    return rows
+    premise_rows = [row for _, row in premises.iterrows()]
+    combos = [
+        (hyp_idx, hypothesis, prem_idx, row)
+        for hyp_idx, hypothesis in enumerate(hypotheses)
+        if str(hypothesis).strip()
+        for prem_idx, row in enumerate(premise_rows)
+    ]
+    batch_scores, anytime_stats = score_anytime(
+        nli_scorer,
+        [(str(row["premise_text"]), hypothesis) for _, hypothesis, _, row in combos],
+        [float(similarity_matrix[h_idx, p_idx]) for h_idx, _, p_idx, _ in combos],
+        deadline,
+    )
+    for (hyp_idx, hypothesis, prem_idx, row), scores in zip(combos, batch_scores):
+        scored = scores is not None
+        scores = scores if scored else unscored_scores()
+        premise_text = str(row["premise_text"])
+        ent = float(scores.get("ENTAILMENT", 0.0))
+        con = float(scores.get("CONTRADICTION", 0.0))
+        neu = float(scores.get("NEUTRAL", 0.0))
+        verdict = max(
+            [("ENTAIL", ent), ("CONTRADICT", con), ("NEUTRAL", neu)],
+            key=lambda pair: pair[1],
+        )[0]
+        if not scored:
+            verdict = UNSCORED_VERDICT
+        similarity = float(similarity_matrix[hyp_idx, prem_idx])
+        combined_score = ent
+        pair = create_forecast_pair(
+            hypothesis=hypothesis,
+            premise_id=str(row.get("premise_id", "")),
+            premise_text=premise_text,
+            quote=row.get("risk_text_quote") or row.get("quote"),
+            segment=row.get("segment"),
+            region=row.get("region"),
+            year=None,
+            source=row.get("pdf_filename") or row.get("source"),
+            kind=row.get("risk_type") or "forecast",
+            nli_target=None,
+            entailment=ent,
+            contradiction=con,
+            neutral=neu,
+            verdict=verdict,
+            similarity=similarity,
+            combined_score=combined_score,
+            pdf_name=row.get("pdf_filename"),
+            page=(
+                int(row.get("page_start"))
+                if not pd.isna(row.get("page_start"))
+                else DEFAULT_PAGE
+            ),
+            strategy_title=strategy_title,
+            strategy_segment=strategy_segment,
+            strategy_region=strategy_region,
+            strategy_focus=strategy_focus,
+            strategy_direction=strategy_direction,
+            model_name=nli_scorer.model_name,
+        )
+        pair_dict = pair.to_dict()
+        if not scored:
+            pair_dict["nli_scored"] = False
+        rows.append(pair_dict)
+    return rows, anytime_stats
 
 
 def main() -> None:
+    deadline = Deadline.from_env()
     print(f"➡️ Lade Hypothesen aus {STRATEGY_WITH_HYPOTHESES}")
     strategy_data = load_strategy_data()
     hypotheses: List[str] = [
@@ -189,8 +226,13 @@ def main() -> None:
     sim_matrix = compute_similarity_matrix(hypotheses, premise_texts)
     nli_scorer = get_nli_scorer()
     print(f"➡️ NLI Backend: {nli_scorer.backend} ({nli_scorer.model_name})")
+    pretokenized = nli_scorer.load_premise_tokens(PATHS.merged_premises_file)
+    if pretokenized:
+        print(f"ℹ️ {pretokenized} vortokenisierte Premises geladen.")
     print("➡️ Scoring Hypothesis/Premise Kombinationen …")
-    pairs = build_pairs(hypotheses, forecasts, nli_scorer, sim_matrix, strategy_data)
+    pairs, anytime_stats = build_pairs(
+        hypotheses, forecasts, nli_scorer, sim_matrix, strategy_data, deadline
+    )
     if not pairs:
         print("⚠️ Keine Forecast-Paare erzeugt.")
         return
@@ -217,7 +259,9 @@ def main() -> None:
         pairs=rows_sorted,
         metadata={
             "source": str(FORECASTS_PARQUET),
-            "embedding_model": EMBEDDING_MODEL,
+            "embedding_model": embedder.model,
+            "nli_stats": nli_scorer.stats(),
+            "nli_anytime": anytime_stats,
         },
     )
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
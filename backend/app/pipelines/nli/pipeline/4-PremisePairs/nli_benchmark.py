@@ -0,0 +1,326 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PIPELINE_ROOT = BASE_DIR.parent
+
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from paths import PipelinePaths
+from shared.nli_autotune import host_fingerprint, save_tuned
+from shared.nli_reference import synthetic_pairs
+from shared.nli_scoring import model_name_from_env
+from shared.time_utils import ts_utc
+
+PATHS = PipelinePaths.from_file(Path(__file__))
+
+OUTPUT_DIR = PATHS.pipeline_reports_dir / "nli-benchmark"
+
+DEFAULT_PAIR_COUNT = 128
+
+DEFAULT_BATCH_SIZES = "1,8,16,32"
+
+DEFAULT_BACKENDS = "local"
+
+AUTOTUNE_PAIR_COUNT = 64
+
+AUTOTUNE_BATCH_SIZES = "1,4,8,16,32"
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    import numpy as np
+
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _str_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def probe(
+    backend: str, model_name: str, threads: int, batch_sizes: List[int], count: int
+) -> None:
+    import torch
+    from shared.nli_scoring import build_model_scorer
+
+    torch.set_num_threads(threads)
+    pairs = synthetic_pairs(count)
+    scorer = build_model_scorer(backend, model_name, cached=False, pooled=False)
+    start = time.perf_counter()
+    scorer.score_batch(pairs[:1])
+    load_seconds = time.perf_counter() - start
+    runs: List[Dict[str, Any]] = []
+    for batch_size in batch_sizes:
+        scorer.score_batch(pairs[:batch_size], batch_size)
+        latencies: List[float] = []
+        start = time.perf_counter()
+        for offset in range(0, len(pairs), batch_size):
+            chunk = pairs[offset : offset + batch_size]
+            chunk_start = time.perf_counter()
+            scorer.score_batch(chunk, batch_size)
+            latencies.extend([time.perf_counter() - chunk_start] * len(chunk))
+        total_seconds = time.perf_counter() - start
+        runs.append(
+            {
+                "batch_size": batch_size,
+                "pairs": len(pairs),
+                "seconds": total_seconds,
+                "pairs_per_sec": len(pairs) / total_seconds if total_seconds else 0.0,
+                "latency_p50_ms": _percentile(latencies, 50) * 1000,
+                "latency_p95_ms": _percentile(latencies, 95) * 1000,
+                "latency_p99_ms": _percentile(latencies, 99) * 1000,
+            }
+        )
+    print(
+        json.dumps(
+            {
+                "backend": backend,
+                "threads": threads,
+                "load_seconds": load_seconds,
+                "peak_rss_mb": _peak_rss_mb(),
+                "runs": runs,
+            }
+        )
+    )
+
+
+def _run_probe(
+    backend: str, model_name: str, threads: int, batch_sizes: List[int], count: int
+) -> Dict[str, Any]:
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "probe",
+        "--backends",
+        backend,
+        "--model",
+        model_name,
+        "--threads",
+        str(threads),
+        "--batch-sizes",
+        ",".join(str(size) for size in batch_sizes),
+        "--pairs",
+        str(count),
+    ]
+    env = {
+        **os.environ,
+        "NLI_NUM_THREADS": str(threads),
+        "NLI_CACHE": "false",
+        "NLI_AUTOTUNE": "false",
+    }
+    result = subprocess.run(
+        command, capture_output=True, text=True, cwd=str(BASE_DIR), env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"{backend} probe ({threads} threads) failed: {result.stderr[-500:]}"
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=str(BASE_DIR),
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmark(
+    model_name: str,
+    backends: List[str],
+    threads: List[int],
+    batch_sizes: List[int],
+    count: int,
+) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for backend in backends:
+        for thread_count in threads:
+            print(f"➡️ Benchmark {backend} · {thread_count} Threads · {count} Paare …")
+            probe_result = _run_probe(
+                backend, model_name, thread_count, batch_sizes, count
+            )
+            results.append(probe_result)
+            for run in probe_result["runs"]:
+                print(
+                    f"ℹ️ {backend} t={thread_count} bs={run['batch_size']}: "
+                    f"{run['pairs_per_sec']:.1f} pairs/s, "
+                    f"p50 {run['latency_p50_ms']:.0f} ms, "
+                    f"p95 {run['latency_p95_ms']:.0f} ms, "
+                    f"p99 {run['latency_p99_ms']:.0f} ms"
+                )
+            print(
+                f"ℹ️ {backend} t={thread_count}: Laden {probe_result['load_seconds']:.1f}s, "
+                f"Peak-RSS {probe_result['peak_rss_mb']:.0f} MB"
+            )
+    return {
+        "created_at": ts_utc(),
+        "git_commit": _git_commit(),
+        "model_name": model_name,
+        "pair_count": count,
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def _thread_candidates() -> List[int]:
+    cpus = os.cpu_count() or 1
+    candidates = {cpus}
+    threads = 1
+    while threads < cpus:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+
+def autotune(
+    model_name: str,
+    backends: List[str],
+    threads: List[int],
+    batch_sizes: List[int],
+    count: int,
+) -> None:
+    print(f"➡️ Autotune für Host {host_fingerprint()} …")
+    for backend in backends:
+        best: Optional[Dict[str, Any]] = None
+        for thread_count in threads:
+            probe_result = _run_probe(
+                backend, model_name, thread_count, batch_sizes, count
+            )
+            for run in probe_result["runs"]:
+                print(
+                    f"ℹ️ {backend} t={thread_count} bs={run['batch_size']}: "
+                    f"{run['pairs_per_sec']:.1f} pairs/s"
+                )
+                if best is None or run["pairs_per_sec"] > best["pairs_per_sec"]:
+                    best = {
+                        "batch_size": run["batch_size"],
+                        "threads": thread_count,
+                        "pairs_per_sec": run["pairs_per_sec"],
+                        "latency_p95_ms": run["latency_p95_ms"],
+                    }
+        if best is None:
+            continue
+        best.update({"tuned_at": ts_utc(), "git_commit": _git_commit()})
+        target = save_tuned(backend, model_name, best)
+        print(
+            f"✅ {backend}: batch {best['batch_size']}, {best['threads']} Threads "
+            f"({best['pairs_per_sec']:.1f} pairs/s) → {target}"
+        )
+
+
+def _result_key(result: Dict[str, Any], run: Dict[str, Any]) -> str:
+    return f"{result['backend']}/t{result['threads']}/bs{run['batch_size']}"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    previous = {
+        _result_key(result, run): run
+        for result in baseline.get("results", [])
+        for run in result.get("runs", [])
+    }
+    print(f"➡️ Vergleich mit Baseline {baseline.get('git_commit') or '?'}")
+    for result in current["results"]:
+        for run in result["runs"]:
+            key = _result_key(result, run)
+            old = previous.get(key)
+            if not old or not old.get("pairs_per_sec"):
+                continue
+            change = run["pairs_per_sec"] / old["pairs_per_sec"] - 1
+            marker = "⚠️" if change < -0.1 else "ℹ️"
+            print(
+                f"{marker} {key}: {old['pairs_per_sec']:.1f} → "
+                f"{run['pairs_per_sec']:.1f} pairs/s ({change:+.1%})"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark NLI scorer throughput, latency, load time and RSS"
+    )
+    parser.add_argument(
+        "command", nargs="?", default="run", choices=["run", "probe", "autotune"]
+    )
+    parser.add_argument("--model", default=model_name_from_env())
+    parser.add_argument("--backends", default=DEFAULT_BACKENDS)
+    parser.add_argument("--threads", default=None)
+    parser.add_argument("--batch-sizes", default=None)
+    parser.add_argument("--pairs", type=int, default=None)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None, help="Earlier benchmark JSON")
+    args = parser.parse_args()
+    tuning = args.command == "autotune"
+    batch_sizes = _int_list(
+        args.batch_sizes or (AUTOTUNE_BATCH_SIZES if tuning else DEFAULT_BATCH_SIZES)
+    )
+    count = args.pairs or (AUTOTUNE_PAIR_COUNT if tuning else DEFAULT_PAIR_COUNT)
+    if tuning:
+        threads = _int_list(args.threads) if args.threads else _thread_candidates()
+        autotune(args.model, _str_list(args.backends), threads, batch_sizes, count)
+        return
+    if args.threads is None:
+        args.threads = str(os.cpu_count() or 1)
+    if args.command == "probe":
+        probe(
+            _str_list(args.backends)[0],
+            args.model,
+            _int_list(args.threads)[0],
+            batch_sizes,
+            count,
+        )
+        return
+    result = run_benchmark(
+        args.model,
+        _str_list(args.backends),
+        _int_list(args.threads),
+        batch_sizes,
+        count,
+    )
+    if args.output:
+        output_file = Path(args.output).resolve()
+    else:
+        stamp = result["created_at"].replace(":", "").replace("-", "")[:15]
+        output_file = (
+            OUTPUT_DIR / f"benchmark-{stamp}-{result['git_commit'] or 'local'}.json"
+        )
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"✅ Benchmark gespeichert → {output_file}")
+    if args.baseline:
+        compare(result, json.loads(Path(args.baseline).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PIPELINE_ROOT = BASE_DIR.parent
+
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from shared.nli_onnx import ONNX_FILE_NAME, OnnxNliScorer, onnx_export_dir
+from shared.nli_reference import LABELS, REFERENCE_PAIRS, verdict
+from shared.nli_scoring import LocalNliScorer, model_name_from_env
+from shared.time_utils import ts_utc
+
+
+def export_model(model_name: str, export_dir: Path, opset: int) -> Path:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    class _LogitsOnly(torch.nn.Module):
+        def __init__(self, model: Any, input_names: List[str]) -> None:
+            super().__init__()
+            self.model = model
+            self.input_names = input_names
+
+        def forward(self, *inputs: Any) -> Any:
+            return self.model(**dict(zip(self.input_names, inputs))).logits
+
+    print(f"➡️ Lade {model_name} für den ONNX-Export …")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    sample = tokenizer(
+        [REFERENCE_PAIRS[0][0]], [REFERENCE_PAIRS[0][1]], return_tensors="pt"
+    )
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in sample
+    ]
+    dynamic_axes: Dict[str, Dict[int, str]] = {
+        name: {0: "batch", 1: "sequence"} for name in input_names
+    }
+    dynamic_axes["logits"] = {0: "batch"}
+    export_dir.mkdir(parents=True, exist_ok=True)
+    target = export_dir / ONNX_FILE_NAME
+    print(f"➡️ Exportiere ONNX-Graph → {target}")
+    with torch.inference_mode():
+        torch.onnx.export(
+            _LogitsOnly(model, input_names),
+            tuple(sample[name] for name in input_names),
+            str(target),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False,
+        )
+    tokenizer.save_pretrained(str(export_dir))
+    model.config.save_pretrained(str(export_dir))
+    print(f"✅ ONNX-Export abgeschlossen: {export_dir}")
+    return target
+
+
+def check_parity(model_name: str, export_dir: Path, tolerance: float) -> Dict[str, Any]:
+    torch_scorer = LocalNliScorer(model_name=model_name)
+    onnx_scorer = OnnxNliScorer(model_name=model_name, export_dir=export_dir)
+    torch_scores = torch_scorer.score_batch(REFERENCE_PAIRS)
+    onnx_scores = onnx_scorer.score_batch(REFERENCE_PAIRS)
+    max_abs_diff = {
+        label: max(
+            abs(t.get(label, 0.0) - o.get(label, 0.0))
+            for t, o in zip(torch_scores, onnx_scores)
+        )
+        for label in LABELS
+    }
+    agreement = sum(
+        1 for t, o in zip(torch_scores, onnx_scores) if verdict(t) == verdict(o)
+    ) / len(REFERENCE_PAIRS)
+    return {
+        "created_at": ts_utc(),
+        "model_name": model_name,
+        "export_dir": str(export_dir),
+        "pair_count": len(REFERENCE_PAIRS),
+        "tolerance": tolerance,
+        "max_abs_diff": max_abs_diff,
+        "label_agreement": agreement,
+        "passed": agreement == 1.0
+        and all(diff <= tolerance for diff in max_abs_diff.values()),
+        "pairs": [
+            {"premise": p, "hypothesis": h, "torch": t, "onnx": o}
+            for (p, h), t, o in zip(REFERENCE_PAIRS, torch_scores, onnx_scores)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export the configured NLI model to ONNX and verify parity with torch"
+    )
+    parser.add_argument("command", choices=["export", "parity", "all"])
+    parser.add_argument("--model", default=model_name_from_env())
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--tolerance", type=float, default=1e-3)
+    args = parser.parse_args()
+    export_dir = (
+        Path(args.output_dir).resolve()
+        if args.output_dir
+        else onnx_export_dir(args.model)
+    )
+    if args.command in {"export", "all"}:
+        export_model(args.model, export_dir, args.opset)
+    if args.command in {"parity", "all"}:
+        report = check_parity(args.model, export_dir, args.tolerance)
+        report_file = export_dir / "parity.json"
+        report_file.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        diffs = ", ".join(f"{k}={v:.2e}" for k, v in report["max_abs_diff"].items())
+        print(f"ℹ️ Max. Abweichung torch ↔ onnx: {diffs}")
+        print(f"ℹ️ Label-Übereinstimmung: {report['label_agreement']:.0%}")
+        print(f"➡️ Parity-Report → {report_file}")
+        if not report["passed"]:
+            print(f"⚠️ ONNX-Parität außerhalb der Toleranz {args.tolerance}.")
+            raise SystemExit(1)
+        print("✅ ONNX-Parität bestätigt.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PIPELINE_ROOT = BASE_DIR.parent
+
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from shared.nli_reference import LABELS, REFERENCE_PAIRS, verdict
+from shared.nli_scoring import ScorePair, model_name_from_env
+from shared.time_utils import ts_utc
+
+DEFAULT_BUDGET_MB = 1024
+
+
+def prepare(model_name: str, export_dir: Path) -> None:
+    import torch
+    from safetensors.torch import save_file
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from shared.nli_quantized import (
+        INT8_SCALE_SUFFIX,
+        INT8_WEIGHT_SUFFIX,
+        MANIFEST_FILE_NAME,
+        WEIGHTS_FILE_NAME,
+        quantize_per_channel,
+    )
+
+    print(f"➡️ Lade {model_name} (fp32) für die Quantisierung …")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    state: Dict[str, torch.Tensor] = {}
+    quantized: List[str] = []
+    for name, module in model.named_modules():
+        if not isinstance(module, torch.nn.Linear):
+            continue
+        q_weight, scale = quantize_per_channel(module.weight.detach().float())
+        state[f"{name}{INT8_WEIGHT_SUFFIX}"] = q_weight
+        state[f"{name}{INT8_SCALE_SUFFIX}"] = scale
+        if module.bias is not None:
+            state[f"{name}.bias"] = module.bias.detach().float().contiguous().clone()
+        quantized.append(name)
+    quantized_params = {f"{name}.weight" for name in quantized} | {
+        f"{name}.bias" for name in quantized
+    }
+    for name, tensor in list(model.named_parameters()) + list(model.named_buffers()):
+        if name in quantized_params or name in state:
+            continue
+        state[name] = tensor.detach().contiguous().clone()
+    export_dir.mkdir(parents=True, exist_ok=True)
+    save_file(state, str(export_dir / WEIGHTS_FILE_NAME))
+    tokenizer.save_pretrained(str(export_dir))
+    model.config.save_pretrained(str(export_dir))
+    manifest = {
+        "model_name": model_name,
+        "created_at": ts_utc(),
+        "scheme": "dynamic int8, symmetric per-channel weights",
+        "quantized_linears": quantized,
+    }
+    (export_dir / MANIFEST_FILE_NAME).write_text(
+        json.dumps(manifest, indent=2), encoding="utf-8"
+    )
+    size_mb = (export_dir / WEIGHTS_FILE_NAME).stat().st_size / 1024**2
+    print(
+        f"✅ {len(quantized)} Linear-Layer quantisiert → {export_dir} ({size_mb:.0f} MB)"
+    )
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def probe(backend: str, model_name: str, export_dir: Path, pairs_file: Path) -> None:
+    from shared.nli_quantized import QuantizedNliScorer
+    from shared.nli_scoring import LocalNliScorer
+
+    pairs = [tuple(item) for item in json.loads(pairs_file.read_text(encoding="utf-8"))]
+    scorer = (
+        QuantizedNliScorer(model_name=model_name, export_dir=export_dir)
+        if backend == "int8"
+        else LocalNliScorer(model_name=model_name)
+    )
+    start = time.perf_counter()
+    scorer._ensure_model()
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    scores = scorer.score_batch(pairs)
+    score_seconds = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "backend": backend,
+                "peak_rss_mb": _peak_rss_mb(),
+                "load_seconds": load_seconds,
+                "score_seconds": score_seconds,
+                "scores": scores,
+            }
+        )
+    )
+
+
+def _load_pairs(pairs_from: Path | None, limit: int) -> List[ScorePair]:
+    if pairs_from is None:
+        return list(REFERENCE_PAIRS)
+    data = json.loads(pairs_from.read_text(encoding="utf-8"))
+    items = data.get("results") or data.get("pairs") or data.get("combined_pairs") or []
+    pairs: List[ScorePair] = []
+    for item in items:
+        premise = item.get("premise_text") or item.get("risk_text")
+        hypothesis = item.get("hypothesis")
+        if premise and hypothesis:
+            pairs.append((str(premise), str(hypothesis)))
+    return pairs[:limit] or list(REFERENCE_PAIRS)
+
+
+def _run_probe(
+    backend: str, model_name: str, export_dir: Path, pairs_file: Path
+) -> Dict[str, Any]:
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "probe",
+        "--backend",
+        backend,
+        "--model",
+        model_name,
+        "--output-dir",
+        str(export_dir),
+        "--pairs-json",
+        str(pairs_file),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, cwd=str(BASE_DIR))
+    if result.returncode != 0:
+        raise RuntimeError(f"{backend} probe failed: {result.stderr[-500:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def report(
+    model_name: str,
+    export_dir: Path,
+    pairs_from: Path | None,
+    limit: int,
+    budget_mb: int,
+) -> Dict[str, Any]:
+    pairs = _load_pairs(pairs_from, limit)
+    pairs_file = export_dir / "report_pairs.json"
+    pairs_file.write_text(json.dumps(pairs, ensure_ascii=False), encoding="utf-8")
+    print(f"➡️ Vergleiche fp32 ↔ int8 auf {len(pairs)} Paaren (je eigener Prozess) …")
+    fp32 = _run_probe("local", model_name, export_dir, pairs_file)
+    int8 = _run_probe("int8", model_name, export_dir, pairs_file)
+    agreement = sum(
+        1 for a, b in zip(fp32["scores"], int8["scores"]) if verdict(a) == verdict(b)
+    ) / max(1, len(pairs))
+    abs_diff = {
+        label: max(
+            (abs(a[label] - b[label]) for a, b in zip(fp32["scores"], int8["scores"])),
+            default=0.0,
+        )
+        for label in LABELS
+    }
+    return {
+        "created_at": ts_utc(),
+        "model_name": model_name,
+        "export_dir": str(export_dir),
+        "pair_count": len(pairs),
+        "budget_mb": budget_mb,
+        "label_agreement": agreement,
+        "max_abs_diff": abs_diff,
+        "backends": {
+            run["backend"]: {k: v for k, v in run.items() if k != "scores"}
+            for run in (fp32, int8)
+        },
+        "int8_within_budget": int8["peak_rss_mb"] <= budget_mb,
+    }
+
+
+def main() -> None:
+    from shared.nli_quantized import int8_export_dir
+
+    parser = argparse.ArgumentParser(
+        description="Prepare and evaluate the int8, memory-mapped NLI model"
+    )
+    parser.add_argument("command", choices=["prepare", "report", "all", "probe"])
+    parser.add_argument("--model", default=model_name_from_env())
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--pairs-from", default=None, help="Pair report JSON to sample")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--budget-mb", type=int, default=DEFAULT_BUDGET_MB)
+    parser.add_argument("--backend", choices=["local", "int8"], default="int8")
+    parser.add_argument("--pairs-json", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    export_dir = (
+        Path(args.output_dir).resolve()
+        if args.output_dir
+        else int8_export_dir(args.model)
+    )
+    if args.command == "probe":
+        probe(args.backend, args.model, export_dir, Path(args.pairs_json))
+        return
+    if args.command in {"prepare", "all"}:
+        prepare(args.model, export_dir)
+    if args.command in {"report", "all"}:
+        result = report(
+            args.model,
+            export_dir,
+            Path(args.pairs_from) if args.pairs_from else None,
+            args.limit,
+            args.budget_mb,
+        )
+        report_file = export_dir / "int8_report.json"
+        report_file.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        for backend, run in result["backends"].items():
+            print(
+                f"ℹ️ {backend}: Peak-RSS {run['peak_rss_mb']:.0f} MB, "
+                f"Laden {run['load_seconds']:.1f}s, Scoring {run['score_seconds']:.1f}s"
+            )
+        print(f"ℹ️ Label-Übereinstimmung int8 ↔ fp32: {result['label_agreement']:.1%}")
+        print(f"➡️ Report → {report_file}")
+        if not result["int8_within_budget"]:
+            print(f"⚠️ int8 Peak-RSS überschreitet das Budget von {args.budget_mb} MB.")
+            raise SystemExit(1)
+        print(f"✅ int8-Modus bleibt unter {args.budget_mb} MB.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PIPELINE_ROOT = BASE_DIR.parent
+
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from embedding_providers import (
+    EmbeddingProvider,
+    embedding_model_from_env,
+    get_embedding_provider,
+)
+from paths import PipelinePaths
+from shared.nli_reference import LABELS
+from shared.nli_surrogate import (
+    DEFAULT_EMBEDDING_PROVIDER,
+    RELEVANCE_THRESHOLD,
+    SurrogateNliModel,
+    embed_texts,
+    surrogate_path_from_env,
+)
+from shared.time_utils import ts_utc
+from vector_store import IndexVectors
+
+PATHS = PipelinePaths.from_file(Path(__file__))
+
+DEFAULT_PAIR_SOURCES = [
+    PATHS.forecast_reports_out_dir / "premise_hypothesis_pairs.json",
+    PATHS.forecast_reports_out_dir / "forecast_pairs.json",
+    PATHS.risk_reports_out_dir / "risk_pairs_nli_simple.json",
+]
+
+INDEX_SOURCES = [
+    (
+        PATHS.embeddings_index_dir / "premises.faiss",
+        PATHS.embeddings_index_dir / "premises_meta.parquet",
+        "premise_text",
+    ),
+    (
+        PATHS.embeddings_index_dir / "risks.faiss",
+        PATHS.embeddings_index_dir / "risks_meta.parquet",
+        "nli",
+    ),
+]
+
+TrainingPair = Tuple[str, str, List[float]]
+
+
+def load_training_pairs(sources: List[Path]) -> List[TrainingPair]:
+    seen: Dict[Tuple[str, str], List[float]] = {}
+    for source in sources:
+        if not source.exists():
+            print(f"ℹ️ Übersprungen (fehlt): {source}")
+            continue
+        data = json.loads(source.read_text(encoding="utf-8"))
+        items = data.get("results") or data.get("pairs") or data.get("combined_pairs")
+        count = 0
+        for item in items or []:
+            if item.get("nli_scored") is False:
+                continue
+            premise = item.get("premise_text")
+            hypothesis = item.get("hypothesis")
+            if not premise or not hypothesis:
+                continue
+            try:
+                target = [float(item[label.lower()]) for label in LABELS]
+            except (KeyError, TypeError, ValueError):
+                continue
+            seen[(str(hypothesis), str(premise))] = target
+            count += 1
+        print(f"ℹ️ {count} Paare aus {source}")
+    return [(hyp, prem, target) for (hyp, prem), target in seen.items()]
+
+
+def _vectors_for(texts: List[str], embedder: EmbeddingProvider) -> np.ndarray:
+    vectors = np.zeros((len(texts), 0), dtype="float32")
+    missing = np.ones(len(texts), dtype=bool)
+    for index_file, meta_file, text_col in INDEX_SOURCES:
+        if not index_file.exists() or not meta_file.exists():
+            continue
+        lookup = IndexVectors.from_index(index_file, meta_file, text_col)
+        if vectors.shape[1] == 0:
+            vectors = np.zeros((len(texts), lookup.dim), dtype="float32")
+        found_vectors, found = lookup.lookup(texts)
+        fill = found & missing
+        vectors[fill] = found_vectors[fill]
+        missing &= ~found
+    if missing.any():
+        print(f"➡️ Embedde {int(missing.sum())} Texte ohne Index-Vektor …")
+        embedded = embed_texts([texts[i] for i in np.flatnonzero(missing)], embedder)
+        if vectors.shape[1] == 0:
+            vectors = np.zeros((len(texts), embedded.shape[1]), dtype="float32")
+        vectors[missing] = embedded
+    return vectors
+
+
+def _is_validation(hypothesis: str) -> bool:
+    return int(hashlib.sha256(hypothesis.encode("utf-8")).hexdigest(), 16) % 5 == 0
+
+
+def evaluate(
+    model: SurrogateNliModel,
+    hyp_texts: List[str],
+    hyp_vecs: np.ndarray,
+    prem_vecs: np.ndarray,
+    targets: np.ndarray,
+    top_n: int,
+) -> Dict[str, Any]:
+    if not len(targets):
+        return {"pairs": 0}
+    probs = np.vstack(
+        [model.predict(h, p[None, :]) for h, p in zip(hyp_vecs, prem_vecs)]
+    )
+    log_loss = float(-(targets * np.log(probs + 1e-9)).sum(axis=1).mean())
+    agreement = float((probs.argmax(axis=1) == targets.argmax(axis=1)).mean())
+    relevant_idx = [LABELS.index("ENTAILMENT"), LABELS.index("CONTRADICTION")]
+    relevant = targets[:, relevant_idx].max(axis=1) >= RELEVANCE_THRESHOLD
+    predicted = probs[:, relevant_idx].max(axis=1)
+    hits = total = kept = 0
+    for hypothesis in sorted(set(hyp_texts)):
+        rows = np.array([i for i, h in enumerate(hyp_texts) if h == hypothesis])
+        ranked = rows[np.argsort(-predicted[rows])][:top_n]
+        hits += int(relevant[ranked].sum())
+        total += int(relevant[rows].sum())
+        kept += len(ranked)
+    return {
+        "pairs": int(len(targets)),
+        "log_loss": log_loss,
+        "label_agreement": agreement,
+        "relevant_pairs": total,
+        f"recall_at_{top_n}": (hits / total) if total else None,
+        "kept_fraction": kept / len(targets),
+    }
+
+
+def train(
+    sources: List[Path],
+    output: Path,
+    embedding_provider: str,
+    embedding_model: str,
+    epochs: int,
+    top_n: int,
+) -> Dict[str, Any]:
+    pairs = load_training_pairs(sources)
+    if not pairs:
+        raise SystemExit("⚠️ Keine Trainingspaare gefunden (Pair-Reports fehlen).")
+    hyp_texts = [hyp for hyp, _, _ in pairs]
+    prem_texts = [prem for _, prem, _ in pairs]
+    targets = np.array([target for _, _, target in pairs], dtype="float32")
+    targets = targets / np.clip(targets.sum(axis=1, keepdims=True), 1e-9, None)
+    embedder = get_embedding_provider(
+        embedding_model, timeout=30, provider=embedding_provider
+    )
+    unavailable = embedder.unavailable_reason()
+    if unavailable is not None:
+        raise SystemExit(f"⚠️ {unavailable}; Surrogate kann nicht trainiert werden.")
+    unique_hyps = sorted(set(hyp_texts))
+    hyp_lookup = dict(zip(unique_hyps, embed_texts(unique_hyps, embedder)))
+    hyp_vecs = np.vstack([hyp_lookup[h] for h in hyp_texts])
+    prem_vecs = _vectors_for(prem_texts, embedder)
+    if prem_vecs.shape[1] != hyp_vecs.shape[1]:
+        raise SystemExit(
+            f"⚠️ Index-Dimension {prem_vecs.shape[1]} passt nicht zu "
+            f"{embedder.name}/{embedder.model} ({hyp_vecs.shape[1]}); "
+            "Index mit demselben EMBED_PROVIDER neu bauen."
+        )
+    val_mask = np.array([_is_validation(h) for h in hyp_texts])
+    if val_mask.all() or not val_mask.any():
+        val_mask = np.zeros(len(pairs), dtype=bool)
+    print(
+        f"➡️ Trainiere Surrogate auf {int((~val_mask).sum())} Paaren "
+        f"({int(val_mask.sum())} Validierung, Dimension {hyp_vecs.shape[1]}) …"
+    )
+    model = SurrogateNliModel.fit(
+        hyp_vecs[~val_mask],
+        prem_vecs[~val_mask],
+        targets[~val_mask],
+        embedding_model=embedding_model,
+        embedding_provider=embedder.name,
+        epochs=epochs,
+    )
+    val_texts = [h for h, is_val in zip(hyp_texts, val_mask) if is_val]
+    model.metrics = {
+        "created_at": ts_utc(),
+        "sources": [str(source) for source in sources],
+        "train_pairs": int((~val_mask).sum()),
+        "validation": evaluate(
+            model,
+            val_texts,
+            hyp_vecs[val_mask],
+            prem_vecs[val_mask],
+            targets[val_mask],
+            top_n,
+        ),
+    }
+    model.save(output)
+    metrics_file = output.with_suffix(".json")
+    metrics_file.write_text(json.dumps(model.metrics, indent=2), encoding="utf-8")
+    print(f"✅ Surrogate gespeichert → {output}")
+    print(f"➡️ Metriken → {metrics_file}")
+    return model.metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Train the embedding surrogate that pre-selects NLI candidates"
+    )
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument(
+        "--pairs-from",
+        action="append",
+        default=None,
+        help="Pair report JSON with stored NLI scores (repeatable)",
+    )
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--embedding-provider", default=DEFAULT_EMBEDDING_PROVIDER)
+    parser.add_argument("--embedding-model", default=None)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=20)
+    args = parser.parse_args()
+    sources = (
+        [Path(item).resolve() for item in args.pairs_from]
+        if args.pairs_from
+        else DEFAULT_PAIR_SOURCES
+    )
+    output = Path(args.output).resolve() if args.output else surrogate_path_from_env()
+    provider = args.embedding_provider.strip().lower()
+    metrics = train(
+        sources,
+        output,
+        provider,
+        args.embedding_model or embedding_model_from_env(provider),
+        args.epochs,
+        args.top_n,
+    )
+    validation = metrics["validation"]
+    if validation.get("pairs"):
+        print(
+            f"ℹ️ Validierung: Label-Übereinstimmung {validation['label_agreement']:.1%}, "
+            f"Recall@{args.top_n} {validation.get(f'recall_at_{args.top_n}')}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PIPELINE_ROOT = BASE_DIR.parent
+
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from shared.nli_batching import MicroBatchingNliScorer, microbatch_enabled_from_env
+from shared.nli_scoring import build_nli_scorer
+
+DEFAULT_HOST = "127.0.0.1"
+
+DEFAULT_PORT = 8765
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class NliWorkerState:
+    def __init__(self, backend: str) -> None:
+        self.scorer = build_nli_scorer(
+            backend, microbatch=microbatch_enabled_from_env(default=True)
+        )
+        self.lock = threading.Lock()
+        self.score_lock = threading.Lock()
+        self.started_at = time.time()
+        self.load_seconds: float | None = None
+        self.requests = 0
+        self.pairs = 0
+
+    def warmup(self) -> None:
+        start = time.perf_counter()
+        self.scorer.score_batch([("The market grows.", "The market grows.")])
+        self.load_seconds = time.perf_counter() - start
+
+    def score(
+        self, pairs: List[Tuple[str, str]], batch_size: Optional[int]
+    ) -> List[Dict[str, float]]:
+        if isinstance(self.scorer, MicroBatchingNliScorer):
+            scores = self.scorer.score_batch(pairs, batch_size)
+        else:
+            with self.score_lock:
+                scores = self.scorer.score_batch(pairs, batch_size)
+        with self.lock:
+            self.requests += 1
+            self.pairs += len(pairs)
+        return scores
+
+    def load_premise_tokens(self, source: Path) -> int:
+        if isinstance(self.scorer, MicroBatchingNliScorer):
+            return self.scorer.load_premise_tokens(source)
+        with self.score_lock:
+            return self.scorer.load_premise_tokens(source)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "model_name": self.scorer.model_name,
+            "backend": self.scorer.backend,
+            "warm": self.load_seconds is not None,
+            "load_seconds": self.load_seconds,
+            "uptime_seconds": time.time() - self.started_at,
+            "requests": self.requests,
+            "pairs": self.pairs,
+        }
+
+
+def _make_handler(state: NliWorkerState) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path.rstrip("/") == "/health":
+                self._send_json(200, state.health())
+                return
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+        def _read_payload(self) -> Optional[Dict[str, Any]]:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length <= 0 or length > MAX_BODY_BYTES:
+                self._send_json(413, {"error": "invalid request size"})
+                return None
+            try:
+                return json.loads(self.rfile.read(length).decode("utf-8"))
+            except Exception as exc:
+                self._send_json(400, {"error": f"malformed request: {exc}"})
+                return None
+
+        def do_POST(self) -> None:
+            route = self.path.rstrip("/")
+            if route not in {"/score", "/premise-tokens"}:
+                self._send_json(404, {"error": f"unknown path {self.path}"})
+                return
+            payload = self._read_payload()
+            if payload is None:
+                return
+            if route == "/premise-tokens":
+                try:
+                    loaded = state.load_premise_tokens(Path(str(payload["source"])))
+                except Exception as exc:
+                    self._send_json(500, {"error": str(exc)})
+                    return
+                self._send_json(200, {"loaded": loaded})
+                return
+            try:
+                pairs = [(str(p), str(h)) for p, h in payload.get("pairs", [])]
+                batch_size = payload.get("batch_size")
+            except Exception as exc:
+                self._send_json(400, {"error": f"malformed request: {exc}"})
+                return
+            try:
+                scores = state.score(pairs, batch_size)
+                stats = state.scorer.stats()
+            except Exception as exc:
+                self._send_json(500, {"error": str(exc)})
+                return
+            self._send_json(
+                200,
+                {
+                    "model_name": state.scorer.model_name,
+                    "scores": scores,
+                    "stats": stats,
+                },
+            )
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+    return Handler
+
+
+def serve(host: str, port: int, backend: str, warmup: bool = True) -> None:
+    state = NliWorkerState(backend)
+    if warmup:
+        print(f"➡️ Lade NLI-Modell für Worker: {state.scorer.model_name}")
+        state.warmup()
+        print(f"✅ NLI-Modell geladen in {state.load_seconds:.1f}s")
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    print(f"✅ NLI Worker läuft auf http://{host}:{port} ({state.scorer.backend})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve NLI scoring from a single resident model over localhost HTTP"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--backend",
+        default=os.getenv("NLI_WORKER_BACKEND", "local"),
+        help="Scorer backend loaded inside the worker (local, onnx, int8 or cascade)",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Load the model lazily on the first request instead of at startup",
+    )
+    args = parser.parse_args()
+    if args.backend == "remote":
+        parser.error("the worker cannot use the remote backend itself")
+    serve(args.host, args.port, args.backend, warmup=not args.no_warmup)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from pathlib import Path
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 from math import isnan
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -20,7 +20,15 @@ if str(PIPELINE_STAGE_DIR) not in sys.path:
 
 from paths import PipelinePaths
 from pair_schema import create_risk_pair
-from shared import NliScorer, get_nli_scorer
+from shared import (
+    UNSCORED_VERDICT,
+    Deadline,
+    NliScorer,
+    get_nli_scorer,
+    score_anytime,
+    surrogate_candidates,
+    unscored_scores,
+)
 
 
 def normalize_region(value: object) -> str:
@@ -165,6 +173,10 @@ PATHS = PipelinePaths.from_file(Path(__file__))
 
 OUTPUT_DIR = PATHS.risk_reports_out_dir
 
+RISK_INDEX_FILE = PATHS.embeddings_index_dir / "risks.faiss"
+
+RISK_META_FILE = PATHS.embeddings_index_dir / "risks_meta.parquet"
+
 
 def _to_float(value: Any, default: float = 0.0) -> float:
     try:
@@ -178,6 +190,7 @@ def rank_risks_for_strategy(
     strategy: Dict,
     risks: List[Dict],
     nli_scorer: NliScorer,
+    scores: Optional[Sequence[Optional[Dict[str, float]]]] = None,
 ) -> List[Dict]:
     pairs: List[Dict] = []
     g_seg = strategy["segment"]
@@ -186,14 +199,17 @@ def rank_risks_for_strategy(
     strategy_title = strategy.get("strategy_title")
     strategy_focus = strategy.get("strategy_focus")
     strategy_direction = strategy.get("strategy_direction")
-    for risk in risks:
+    if scores is None:
+        scores = nli_scorer.score_batch([(risk["premise"], hyp) for risk in risks])
+    for risk, probs in zip(risks, scores):
+        scored = probs is not None
+        probs = probs if scored else unscored_scores()
         r_name = risk["name"]
         r_premise = risk["premise"]
         r_seg = risk["segment"]
         r_reg = risk["region"]
         r_type = risk["risk_type"]
         r_similarity = _to_float(risk.get("similarity", 0.0), 0.0)
-        probs = nli_scorer.score(premise=r_premise, hypothesis=hyp)
         p_con = probs["CONTRADICTION"]
         p_ent = probs.get("ENTAILMENT", 0.0)
         p_neu = probs.get("NEUTRAL", 0.0)
@@ -203,6 +219,8 @@ def rank_risks_for_strategy(
             [("CONTRADICT", p_con), ("ENTAIL", p_ent), ("NEUTRAL", p_neu)],
             key=lambda x: x[1],
         )[0]
+        if not scored:
+            verdict = UNSCORED_VERDICT
         pdf_name = risk.get("pdf_name") or f"{r_seg}-{r_reg}.pdf"
         page = risk.get("page") or 1
         pair = create_risk_pair(
@@ -233,12 +251,16 @@ def rank_risks_for_strategy(
             strategy_direction=strategy_direction,
             model_name=nli_scorer.model_name,
         )
-        pairs.append(pair.to_dict())
+        pair_dict = pair.to_dict()
+        if not scored:
+            pair_dict["nli_scored"] = False
+        pairs.append(pair_dict)
     pairs.sort(key=lambda item: item["combined_score"], reverse=True)
     return pairs
 
 
 def main() -> None:
+    deadline = Deadline.from_env()
     nli_scorer = get_nli_scorer()
     print(f"➡️ NLI Backend: {nli_scorer.backend} ({nli_scorer.model_name})")
     print("➡️ Step 1: Load Strategy + Hypotheses")
@@ -255,10 +277,42 @@ def main() -> None:
     print("➡️ Step 2: Load Risks")
     risks = load_risks_from_parquet(PATHS)
     print(f"ℹ️ Loaded {len(risks)} risks")
+    pretokenized = nli_scorer.load_premise_tokens(PATHS.risks_parquet)
+    if pretokenized:
+        print(f"ℹ️ Loaded {pretokenized} pre-tokenized risk texts")
     print("➡️ Step 3: NLI-based Risk Ranking")
+    candidates, surrogate_stats = surrogate_candidates(
+        [strategy["hypothesis"] for strategy in strategy_variants],
+        [risk["premise"] for risk in risks],
+        RISK_INDEX_FILE,
+        RISK_META_FILE,
+        "nli",
+    )
+    strategy_risks = [
+        [
+            risk
+            for idx, risk in enumerate(risks)
+            if candidates is None or idx in candidates[strategy["hypothesis"]]
+        ]
+        for strategy in strategy_variants
+    ]
+    combos = [
+        (strategy, risk)
+        for strategy, selected in zip(strategy_variants, strategy_risks)
+        for risk in selected
+    ]
+    scores, anytime_stats = score_anytime(
+        nli_scorer,
+        [(risk["premise"], strategy["hypothesis"]) for strategy, risk in combos],
+        [_to_float(risk.get("similarity", 0.0), 0.0) for _, risk in combos],
+        deadline,
+    )
     all_pairs = []
-    for strategy in strategy_variants:
-        pairs = rank_risks_for_strategy(strategy, risks, nli_scorer)
+    offset = 0
+    for strategy, selected in zip(strategy_variants, strategy_risks):
+        strategy_scores = scores[offset : offset + len(selected)]
+        offset += len(selected)
+        pairs = rank_risks_for_strategy(strategy, selected, nli_scorer, strategy_scores)
         all_pairs.extend(pairs)
     print("➡️ Step 4: Save Report")
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -274,6 +328,9 @@ def main() -> None:
                     "hypothesis_count": len(strategy_variants),
                     "risk_count": len(risks),
                     "method": "NLI + Retrieval only",
+                    "nli_stats": nli_scorer.stats(),
+                    "nli_anytime": anytime_stats,
+                    "nli_surrogate": surrogate_stats,
                 },
             },
             f,
@@ -1,5 +1,28 @@
 from __future__ import annotations
-from .nli_scoring import NliScorer, get_nli_scorer
+from .nli_cache import CachedNliScorer, NliResultCache
+from .nli_deadline import (
+    UNSCORED_VERDICT,
+    Deadline,
+    score_anytime,
+    unscored_scores,
+)
+from .nli_remote import RemoteNliScorer
+from .nli_scoring import NliScorer, ScorePair, build_nli_scorer, get_nli_scorer
+from .nli_surrogate import surrogate_candidates
 from .time_utils import ts_utc
 
-__all__ = ["NliScorer", "get_nli_scorer", "ts_utc"]
+__all__ = [
+    "CachedNliScorer",
+    "Deadline",
+    "NliResultCache",
+    "NliScorer",
+    "RemoteNliScorer",
+    "ScorePair",
+    "UNSCORED_VERDICT",
+    "build_nli_scorer",
+    "get_nli_scorer",
+    "score_anytime",
+    "surrogate_candidates",
+    "ts_utc",
+    "unscored_scores",
+]
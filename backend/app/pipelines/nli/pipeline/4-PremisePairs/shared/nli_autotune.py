@@ -0,0 +1,115 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import platform
+from pathlib import Path
+from typing import Any, Dict, Optional
+from paths import PipelinePaths
+
+TUNABLE_ENV = ("NLI_BATCH_SIZE", "NLI_NUM_THREADS")
+
+USER_OVERRIDES = frozenset(name for name in TUNABLE_ENV if os.getenv(name))
+
+_REPORTED: set = set()
+
+
+def autotune_enabled_from_env() -> bool:
+    return os.getenv("NLI_AUTOTUNE", "true").strip().lower() not in {"0", "false", "no"}
+
+
+def autotune_path_from_env() -> Path:
+    configured = os.getenv("NLI_AUTOTUNE_FILE")
+    if configured:
+        return Path(configured).resolve()
+    return PipelinePaths.from_file(Path(__file__)).nli_models_dir / "autotune.json"
+
+
+def _cpu_model() -> str:
+    try:
+        for line in Path("/proc/cpuinfo").read_text(encoding="utf-8").splitlines():
+            if line.lower().startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _memory_gb() -> int:
+    try:
+        pages = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        return round(pages / 1024**3)
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def host_info() -> Dict[str, Any]:
+    import torch
+
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu_model": _cpu_model(),
+        "cpu_count": os.cpu_count() or 1,
+        "memory_gb": _memory_gb(),
+        "torch": torch.__version__,
+    }
+
+
+def host_fingerprint(info: Optional[Dict[str, Any]] = None) -> str:
+    payload = json.dumps(info or host_info(), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _load_all(path: Path) -> Dict[str, Any]:
+    try:
+        if path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def tuning_key(backend: str, model_name: str) -> str:
+    return f"{backend.lower()}:{model_name}"
+
+
+def load_tuned(backend: str, model_name: str) -> Optional[Dict[str, Any]]:
+    hosts = _load_all(autotune_path_from_env())
+    host = hosts.get(host_fingerprint(), {})
+    return host.get("settings", {}).get(tuning_key(backend, model_name))
+
+
+def save_tuned(backend: str, model_name: str, result: Dict[str, Any]) -> Path:
+    path = autotune_path_from_env()
+    hosts = _load_all(path)
+    info = host_info()
+    host = hosts.setdefault(host_fingerprint(info), {"host": info, "settings": {}})
+    host["host"] = info
+    host["settings"][tuning_key(backend, model_name)] = result
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(hosts, indent=2), encoding="utf-8")
+    return path
+
+
+def tuned_settings(backend: str, model_name: str, tune_threads: bool) -> Dict[str, int]:
+    if not autotune_enabled_from_env():
+        return {}
+    tuned = load_tuned(backend, model_name)
+    if not tuned:
+        return {}
+    settings: Dict[str, int] = {}
+    if "NLI_BATCH_SIZE" not in USER_OVERRIDES:
+        settings["batch_size"] = int(tuned["batch_size"])
+    if tune_threads and "NLI_NUM_THREADS" not in USER_OVERRIDES:
+        settings["num_threads"] = int(tuned["threads"])
+    key = tuning_key(backend, model_name)
+    if settings and key not in _REPORTED:
+        _REPORTED.add(key)
+        applied = (
+            [f"batch {settings['batch_size']}"] if "batch_size" in settings else []
+        )
+        if "num_threads" in settings:
+            applied.append(f"{settings['num_threads']} Threads")
+        print(f"ℹ️ Autotune-Einstellungen für {key}: {', '.join(applied)}")
+    return settings
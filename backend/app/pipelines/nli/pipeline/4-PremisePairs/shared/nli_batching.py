@@ -0,0 +1,156 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Final, List, Optional, Sequence
+from .nli_scoring import NliScorer, ScoreDict, ScorePair
+
+DEFAULT_WAIT_MS: Final[float] = 5.0
+
+DEFAULT_MAX_PAIRS: Final[int] = 64
+
+
+def microbatch_enabled_from_env(default: bool = False) -> bool:
+    value = os.getenv("NLI_MICROBATCH", "").strip().lower()
+    if not value:
+        return default
+    return value not in {"0", "false", "no"}
+
+
+def _wait_ms_from_env() -> float:
+    try:
+        return max(0.0, float(os.getenv("NLI_MICROBATCH_WAIT_MS", DEFAULT_WAIT_MS)))
+    except ValueError:
+        return DEFAULT_WAIT_MS
+
+
+def _max_pairs_from_env() -> int:
+    try:
+        return max(1, int(os.getenv("NLI_MICROBATCH_MAX_PAIRS", DEFAULT_MAX_PAIRS)))
+    except ValueError:
+        return DEFAULT_MAX_PAIRS
+
+
+class _PendingRequest:
+    def __init__(self, pairs: List[ScorePair], batch_size: Optional[int]) -> None:
+        self.pairs = pairs
+        self.batch_size = batch_size
+        self.done = threading.Event()
+        self.scores: List[ScoreDict] = []
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatchingNliScorer(NliScorer):
+    def __init__(
+        self,
+        inner: NliScorer,
+        wait_ms: Optional[float] = None,
+        max_pairs: Optional[int] = None,
+    ) -> None:
+        super().__init__(model_name=inner.model_name, backend=inner.backend)
+        self.inner = inner
+        self.wait_seconds = (
+            _wait_ms_from_env() if wait_ms is None else max(0.0, wait_ms)
+        ) / 1000
+        self.max_pairs = max_pairs or _max_pairs_from_env()
+        self._queue: Deque[_PendingRequest] = deque()
+        self._cond = threading.Condition()
+        self._inner_lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._forward_calls = 0
+        self._requests = 0
+        self._pairs = 0
+
+    @property
+    def cache_namespace(self) -> str:
+        return self.inner.cache_namespace
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_forever, name="nli-microbatch", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _collect(self) -> List[_PendingRequest]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            batch = [self._queue.popleft()]
+            total = len(batch[0].pairs)
+            flush_at = time.monotonic() + self.wait_seconds
+            while total < self.max_pairs:
+                if not self._queue:
+                    remaining = flush_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                    continue
+                if total + len(self._queue[0].pairs) > self.max_pairs:
+                    break
+                request = self._queue.popleft()
+                batch.append(request)
+                total += len(request.pairs)
+            return batch
+
+    def _dispatch_forever(self) -> None:
+        while True:
+            batch = self._collect()
+            pairs = [pair for request in batch for pair in request.pairs]
+            batch_size = next(
+                (request.batch_size for request in batch if request.batch_size), None
+            )
+            try:
+                with self._inner_lock:
+                    scores = self.inner.score_batch(pairs, batch_size)
+                    self._forward_calls += 1
+                    self._requests += len(batch)
+                    self._pairs += len(pairs)
+            except BaseException as exc:
+                for request in batch:
+                    request.error = exc
+                    request.done.set()
+                continue
+            offset = 0
+            for request in batch:
+                request.scores = scores[offset : offset + len(request.pairs)]
+                offset += len(request.pairs)
+                request.done.set()
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        return self.score_batch([(premise, hypothesis)])[0]
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        if not pairs:
+            return []
+        request = _PendingRequest(list(pairs), batch_size)
+        with self._cond:
+            self._ensure_dispatcher()
+            self._queue.append(request)
+            self._cond.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.scores
+
+    def load_premise_tokens(self, source: Path) -> int:
+        with self._inner_lock:
+            return self.inner.load_premise_tokens(source)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._inner_lock:
+            inner_stats = self.inner.stats()
+            calls = self._forward_calls
+            return {
+                **inner_stats,
+                "microbatch_calls": calls,
+                "microbatch_requests": self._requests,
+                "microbatch_pairs": self._pairs,
+                "microbatch_requests_per_call": (
+                    (self._requests / calls) if calls else 0.0
+                ),
+            }
@@ -0,0 +1,224 @@
+from __future__ import annotations
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+from paths import PipelinePaths
+from .nli_scoring import NliScorer, ScoreDict, ScorePair
+
+DEFAULT_MAX_ENTRIES: Final[int] = 250_000
+
+LOOKUP_CHUNK: Final[int] = 300
+
+TOUCH_FLUSH_SIZE: Final[int] = 10_000
+
+EVICT_INTERVAL: Final[int] = 1_000
+
+CacheKey = Tuple[str, str, str]
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cache_key(model_name: str, premise: str, hypothesis: str) -> CacheKey:
+    return model_name, _sha256(premise), _sha256(hypothesis)
+
+
+class NliResultCache:
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.evict_interval = min(EVICT_INTERVAL, max(1, self.max_entries // 10))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._touched: Dict[CacheKey, float] = {}
+        self._inserted = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS nli_scores ("
+                "model_name TEXT NOT NULL, "
+                "premise_sha TEXT NOT NULL, "
+                "hypothesis_sha TEXT NOT NULL, "
+                "contradiction REAL NOT NULL, "
+                "entailment REAL NOT NULL, "
+                "neutral REAL NOT NULL, "
+                "last_used REAL NOT NULL, "
+                "PRIMARY KEY (model_name, premise_sha, hypothesis_sha))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_nli_scores_last_used "
+                "ON nli_scores (last_used)"
+            )
+            conn.commit()
+            self._conn = conn
+            atexit.register(self.flush)
+        return self._conn
+
+    def get_many(self, keys: Sequence[CacheKey]) -> List[Optional[ScoreDict]]:
+        if not keys:
+            return []
+        found: Dict[CacheKey, ScoreDict] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(unique), LOOKUP_CHUNK):
+                chunk = unique[start : start + LOOKUP_CHUNK]
+                rows = conn.execute(
+                    "WITH lookup (model_name, premise_sha, hypothesis_sha) AS (VALUES "
+                    + ", ".join(["(?, ?, ?)"] * len(chunk))
+                    + ") SELECT s.model_name, s.premise_sha, s.hypothesis_sha, "
+                    "s.contradiction, s.entailment, s.neutral "
+                    "FROM lookup JOIN nli_scores AS s "
+                    "USING (model_name, premise_sha, hypothesis_sha)",
+                    [part for key in chunk for part in key],
+                ).fetchall()
+                for row in rows:
+                    found[(row[0], row[1], row[2])] = {
+                        "CONTRADICTION": float(row[3]),
+                        "ENTAILMENT": float(row[4]),
+                        "NEUTRAL": float(row[5]),
+                    }
+            now = time.time()
+            self._touched.update((key, now) for key in found)
+            if len(self._touched) >= TOUCH_FLUSH_SIZE:
+                self._flush_touched(conn)
+                conn.commit()
+        return [found.get(key) for key in keys]
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        if not self._touched:
+            return
+        conn.executemany(
+            "UPDATE nli_scores SET last_used = ? "
+            "WHERE model_name = ? AND premise_sha = ? AND hypothesis_sha = ?",
+            [(used, *key) for key, used in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._touched:
+                self._flush_touched(self._conn)
+                self._conn.commit()
+
+    def put_many(self, entries: Sequence[Tuple[CacheKey, ScoreDict]]) -> None:
+        if not entries:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            self._flush_touched(conn)
+            conn.executemany(
+                "INSERT OR REPLACE INTO nli_scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        *key,
+                        float(scores.get("CONTRADICTION", 0.0)),
+                        float(scores.get("ENTAILMENT", 0.0)),
+                        float(scores.get("NEUTRAL", 0.0)),
+                        now,
+                    )
+                    for key, scores in entries
+                ],
+            )
+            self._inserted += len(entries)
+            if self._inserted >= self.evict_interval:
+                self._evict(conn)
+                self._inserted = 0
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (count,) = conn.execute("SELECT COUNT(*) FROM nli_scores").fetchone()
+        overflow = int(count) - self.max_entries
+        if overflow <= 0:
+            return
+        conn.execute(
+            "DELETE FROM nli_scores WHERE rowid IN ("
+            "SELECT rowid FROM nli_scores ORDER BY last_used ASC LIMIT ?)",
+            (overflow,),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = (
+                self._connect().execute("SELECT COUNT(*) FROM nli_scores").fetchone()
+            )
+        return int(count)
+
+
+class CachedNliScorer(NliScorer):
+    def __init__(self, inner: NliScorer, cache: NliResultCache) -> None:
+        super().__init__(model_name=inner.model_name, backend=f"{inner.backend}+cache")
+        self.inner = inner
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        return self.score_batch([(premise, hypothesis)])[0]
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        if not pairs:
+            return []
+        keys = [cache_key(self.inner.cache_namespace, p, h) for p, h in pairs]
+        results = self.cache.get_many(keys)
+        pending: Dict[CacheKey, ScorePair] = {}
+        for key, pair, cached in zip(keys, pairs, results):
+            if cached is None:
+                pending.setdefault(key, pair)
+        missed = sum(1 for cached in results if cached is None)
+        self.hits += len(pairs) - missed
+        self.misses += missed
+        if pending:
+            scored = self.inner.score_batch(list(pending.values()), batch_size)
+            fresh = dict(zip(pending.keys(), scored))
+            self.cache.put_many(list(fresh.items()))
+            results = [
+                cached if cached is not None else fresh[key]
+                for key, cached in zip(keys, results)
+            ]
+        return results
+
+    def load_premise_tokens(self, source: Path) -> int:
+        return self.inner.load_premise_tokens(source)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **self.inner.stats(),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "cache_path": str(self.cache.path),
+        }
+
+
+def cache_enabled_from_env() -> bool:
+    return os.getenv("NLI_CACHE", "true").strip().lower() not in {"0", "false", "no"}
+
+
+def max_entries_from_env() -> int:
+    try:
+        return int(os.getenv("NLI_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def cache_path_from_env() -> Path:
+    override = os.getenv("NLI_CACHE_PATH")
+    if override:
+        return Path(override).resolve()
+    return PipelinePaths.from_file(Path(__file__)).nli_cache_file
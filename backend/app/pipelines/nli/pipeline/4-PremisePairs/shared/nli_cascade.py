@@ -0,0 +1,135 @@
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence
+from .nli_reference import LABELS, verdict
+from .nli_scoring import (
+    NliScorer,
+    ScoreDict,
+    ScorePair,
+    build_model_scorer,
+    model_name_from_env,
+)
+
+DEFAULT_FAST_MODEL_NAME: Final[str] = "cross-encoder/nli-distilroberta-base"
+
+DEFAULT_MARGIN: Final[float] = 0.3
+
+DEFAULT_SCORE_THRESHOLD: Final[float] = 0.15
+
+
+def _float_from_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def top_margin(scores: ScoreDict) -> float:
+    ranked = sorted((scores.get(label, 0.0) for label in LABELS), reverse=True)
+    return ranked[0] - ranked[1]
+
+
+class CascadeNliScorer(NliScorer):
+    def __init__(
+        self,
+        fast: NliScorer,
+        strong: NliScorer,
+        margin: float = DEFAULT_MARGIN,
+        score_threshold: float = DEFAULT_SCORE_THRESHOLD,
+    ) -> None:
+        super().__init__(
+            model_name=strong.model_name,
+            backend=f"cascade[{fast.backend},{strong.backend}]",
+        )
+        self.fast = fast
+        self.strong = strong
+        self.margin = margin
+        self.score_threshold = score_threshold
+        self.pairs = 0
+        self.escalated = 0
+        self.agreements = 0
+        self.abs_diff_sum = 0.0
+
+    def needs_escalation(self, scores: ScoreDict) -> bool:
+        if top_margin(scores) < self.margin:
+            return True
+        return (
+            scores.get("ENTAILMENT", 0.0) >= self.score_threshold
+            or scores.get("CONTRADICTION", 0.0) >= self.score_threshold
+        )
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        return self.score_batch([(premise, hypothesis)])[0]
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        if not pairs:
+            return []
+        results = self.fast.score_batch(pairs, batch_size)
+        escalate = [
+            idx for idx, scores in enumerate(results) if self.needs_escalation(scores)
+        ]
+        self.pairs += len(pairs)
+        self.escalated += len(escalate)
+        if not escalate:
+            return results
+        strong_scores = self.strong.score_batch(
+            [pairs[idx] for idx in escalate], batch_size
+        )
+        results = list(results)
+        for idx, scores in zip(escalate, strong_scores):
+            fast_scores = results[idx]
+            if verdict(fast_scores) == verdict(scores):
+                self.agreements += 1
+            self.abs_diff_sum += max(
+                abs(fast_scores.get(label, 0.0) - scores.get(label, 0.0))
+                for label in LABELS
+            )
+            results[idx] = scores
+        return results
+
+    def load_premise_tokens(self, source: Path) -> int:
+        return max(
+            self.fast.load_premise_tokens(source),
+            self.strong.load_premise_tokens(source),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cascade_pairs": self.pairs,
+            "cascade_escalated": self.escalated,
+            "cascade_escalation_rate": (
+                (self.escalated / self.pairs) if self.pairs else 0.0
+            ),
+            "cascade_agreement": (
+                (self.agreements / self.escalated) if self.escalated else None
+            ),
+            "cascade_mean_max_abs_diff": (
+                (self.abs_diff_sum / self.escalated) if self.escalated else None
+            ),
+            "cascade_margin": self.margin,
+            "cascade_score_threshold": self.score_threshold,
+            "fast_model": self.fast.model_name,
+            "fast": self.fast.stats(),
+            "strong": self.strong.stats(),
+        }
+
+
+def build_cascade_scorer() -> CascadeNliScorer:
+    fast = build_model_scorer(
+        os.getenv("NLI_CASCADE_FAST_BACKEND", "local"),
+        os.getenv("NLI_CASCADE_FAST_MODEL", DEFAULT_FAST_MODEL_NAME),
+    )
+    strong = build_model_scorer(
+        os.getenv("NLI_CASCADE_STRONG_BACKEND", "local"), model_name_from_env()
+    )
+    return CascadeNliScorer(
+        fast,
+        strong,
+        margin=_float_from_env("NLI_CASCADE_MARGIN", DEFAULT_MARGIN),
+        score_threshold=_float_from_env(
+            "NLI_CASCADE_SCORE_THRESHOLD", DEFAULT_SCORE_THRESHOLD
+        ),
+    )
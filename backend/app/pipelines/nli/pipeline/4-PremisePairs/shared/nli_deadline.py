@@ -0,0 +1,128 @@
+from __future__ import annotations
+import os
+import time
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+from .nli_scoring import NliScorer, ScoreDict, ScorePair
+
+DEFAULT_CHUNK_SIZE: Final[int] = 64
+
+UNSCORED_VERDICT: Final[str] = "UNSCORED"
+
+
+def _float_env(name: str) -> Optional[float]:
+    value = os.getenv(name, "").strip()
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class Deadline:
+    def __init__(self, at: Optional[float] = None) -> None:
+        self.at = at
+        self.started_at = time.time()
+
+    @classmethod
+    def from_env(cls) -> "Deadline":
+        candidates = []
+        absolute = _float_env("NLI_DEADLINE_AT")
+        if absolute is not None:
+            candidates.append(absolute)
+        budget = _float_env("NLI_TIME_BUDGET_SECONDS")
+        if budget is not None:
+            candidates.append(time.time() + budget)
+        return cls(min(candidates) if candidates else None)
+
+    def remaining(self) -> Optional[float]:
+        if self.at is None:
+            return None
+        return self.at - time.time()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+
+def unscored_scores() -> ScoreDict:
+    return {"CONTRADICTION": 0.0, "ENTAILMENT": 0.0, "NEUTRAL": 0.0}
+
+
+def _chunk_size_from_env() -> int:
+    try:
+        return max(1, int(os.getenv("NLI_DEADLINE_CHUNK", DEFAULT_CHUNK_SIZE)))
+    except ValueError:
+        return DEFAULT_CHUNK_SIZE
+
+
+def _cache_misses(scorer: NliScorer) -> Optional[int]:
+    misses = scorer.stats().get("cache_misses")
+    return misses if isinstance(misses, int) else None
+
+
+def _model_scored(before: Optional[int], after: Optional[int], count: int) -> int:
+    if before is None or after is None:
+        return count
+    return min(count, max(0, after - before))
+
+
+def _seconds_per_pair(rates: List[float]) -> Optional[float]:
+    if not rates:
+        return None
+    if len(rates) == 1:
+        return rates[0]
+    steady = rates[1:]
+    return max(sum(steady) / len(steady), steady[-1])
+
+
+def score_anytime(
+    scorer: NliScorer,
+    pairs: Sequence[ScorePair],
+    priorities: Sequence[float],
+    deadline: Deadline,
+    chunk_size: Optional[int] = None,
+) -> Tuple[List[Optional[ScoreDict]], Dict[str, Any]]:
+    results: List[Optional[ScoreDict]] = [None] * len(pairs)
+    order = sorted(range(len(pairs)), key=lambda idx: priorities[idx], reverse=True)
+    size = chunk_size or _chunk_size_from_env()
+    rates: List[float] = []
+    scored = 0
+    stopped = False
+    while scored < len(order):
+        chunk = order[scored : scored + size]
+        remaining = deadline.remaining()
+        if remaining is not None:
+            seconds_per_pair = _seconds_per_pair(rates)
+            fits = (
+                len(chunk)
+                if not seconds_per_pair
+                else int(remaining / seconds_per_pair)
+            )
+            if remaining <= 0 or fits < 1:
+                stopped = True
+                break
+            chunk = chunk[:fits]
+        misses = _cache_misses(scorer)
+        chunk_start = time.time()
+        for idx, scores in zip(chunk, scorer.score_batch([pairs[i] for i in chunk])):
+            results[idx] = scores
+        elapsed = time.time() - chunk_start
+        model_pairs = _model_scored(misses, _cache_misses(scorer), len(chunk))
+        if model_pairs:
+            rates.append(elapsed / model_pairs)
+        scored += len(chunk)
+    stats = {
+        "time_budget_seconds": (
+            (deadline.at - deadline.started_at) if deadline.at is not None else None
+        ),
+        "deadline_hit": stopped,
+        "scored_pairs": scored,
+        "unscored_pairs": len(pairs) - scored,
+    }
+    if stopped:
+        print(
+            f"⚠️ NLI-Zeitbudget erreicht: {scored}/{len(pairs)} Paare bewertet, "
+            f"{len(pairs) - scored} als unbewertet markiert."
+        )
+    return results, stats
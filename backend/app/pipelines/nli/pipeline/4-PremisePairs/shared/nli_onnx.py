@@ -0,0 +1,85 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from transformers import AutoTokenizer
+from nli_exports import ONNX_FILE_NAME, export_dir
+from paths import PipelinePaths
+from .nli_scoring import DEFAULT_MODEL_NAME, LocalNliScorer
+
+
+def onnx_export_dir(model_name: str) -> Path:
+    models_dir = PipelinePaths.from_file(Path(__file__)).nli_models_dir
+    return export_dir("onnx", model_name, models_dir)
+
+
+def _load_id2label(export_dir: Path) -> Dict[int, str]:
+    config_file = export_dir / "config.json"
+    if not config_file.exists():
+        raise FileNotFoundError(f"ONNX export config missing: {config_file}")
+    config = json.loads(config_file.read_text(encoding="utf-8"))
+    return {int(k): str(v) for k, v in config.get("id2label", {}).items()}
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class OnnxNliScorer(LocalNliScorer):
+    tensor_type: str = "np"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        batch_size: Optional[int] = None,
+        export_dir: Optional[Path] = None,
+        num_threads: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            model_name=model_name, batch_size=batch_size, num_threads=num_threads
+        )
+        self.backend = "onnx"
+        self.export_dir = export_dir or onnx_export_dir(model_name)
+        self._input_names: List[str] = []
+
+    def _ensure_model(self) -> tuple[AutoTokenizer, Any]:
+        if self._tokenizer is None or self._model is None:
+            try:
+                import onnxruntime as ort
+            except ImportError as exc:
+                raise RuntimeError(
+                    "NLI_BACKEND=onnx requires onnxruntime (pip install onnxruntime)."
+                ) from exc
+            model_file = self.export_dir / ONNX_FILE_NAME
+            if not model_file.exists():
+                raise FileNotFoundError(
+                    f"ONNX model missing: {model_file}. "
+                    "Lauf zuerst 4-PremisePairs/nli_onnx_export.py export."
+                )
+            print(f"➡️ Lade NLI-Modell (ONNX Runtime): {model_file}")
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.num_threads:
+                options.intra_op_num_threads = self.num_threads
+            self._model = ort.InferenceSession(
+                str(model_file), options, providers=["CPUExecutionProvider"]
+            )
+            self._input_names = [item.name for item in self._model.get_inputs()]
+            self._tokenizer = AutoTokenizer.from_pretrained(str(self.export_dir))
+            self._id2label = _load_id2label(self.export_dir)
+        return self._tokenizer, self._model
+
+    def _apply_threads(self) -> None:
+        pass
+
+    def _predict_probs(self, encoded: Any) -> List[List[float]]:
+        feeds = {
+            name: np.asarray(encoded[name], dtype=np.int64)
+            for name in self._input_names
+            if name in encoded
+        }
+        (logits,) = self._model.run(["logits"], feeds)
+        return _softmax(logits.astype(np.float64)).tolist()
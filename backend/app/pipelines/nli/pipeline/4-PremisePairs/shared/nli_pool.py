@@ -0,0 +1,144 @@
+from __future__ import annotations
+import atexit
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .nli_scoring import NliScorer, ScoreDict, ScorePair, build_model_scorer
+
+SHARDS_PER_WORKER = 4
+
+_WORKER_SCORER: Optional[NliScorer] = None
+
+_WORKER_SOURCES: set = set()
+
+
+def pool_workers_from_env() -> int:
+    try:
+        return max(1, int(os.getenv("NLI_POOL_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def threads_per_worker(workers: int) -> int:
+    configured = os.getenv("NLI_NUM_THREADS")
+    if configured:
+        return max(1, int(configured))
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _init_worker(backend: str, model_name: str, threads: int) -> None:
+    global _WORKER_SCORER
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    _WORKER_SCORER = build_model_scorer(
+        backend, model_name, cached=False, pooled=False, num_threads=threads
+    )
+
+
+def _score_shard(
+    pairs: List[ScorePair], batch_size: Optional[int], sources: List[str]
+) -> Tuple[int, List[ScoreDict], Dict[str, Any]]:
+    if _WORKER_SCORER is None:
+        raise RuntimeError("NLI pool worker was not initialised.")
+    for source in sources:
+        if source not in _WORKER_SOURCES:
+            _WORKER_SCORER.load_premise_tokens(Path(source))
+            _WORKER_SOURCES.add(source)
+    scores = _WORKER_SCORER.score_batch(pairs, batch_size)
+    return os.getpid(), scores, _WORKER_SCORER.stats()
+
+
+class PooledNliScorer(NliScorer):
+    def __init__(self, backend: str, model_name: str, workers: int) -> None:
+        threads = threads_per_worker(workers)
+        template = build_model_scorer(
+            backend, model_name, cached=False, pooled=False, num_threads=threads
+        )
+        super().__init__(
+            model_name=template.model_name, backend=f"{template.backend}x{workers}"
+        )
+        self.inner_backend = backend
+        self.workers = workers
+        self.threads = threads
+        self._namespace = template.cache_namespace
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._sources: List[str] = []
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+        self._shards = 0
+
+    @property
+    def cache_namespace(self) -> str:
+        return self._namespace
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            print(
+                f"➡️ Starte NLI-Pool: {self.workers} Prozesse × {self.threads} Threads "
+                f"({self.inner_backend}, {self.model_name})"
+            )
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.inner_backend, self.model_name, self.threads),
+            )
+            atexit.register(self.close)
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        return self.score_batch([(premise, hypothesis)])[0]
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        if not pairs:
+            return []
+        executor = self._ensure_pool()
+        size = max(1, math.ceil(len(pairs) / (self.workers * SHARDS_PER_WORKER)))
+        shards = [
+            list(pairs[start : start + size]) for start in range(0, len(pairs), size)
+        ]
+        futures = [
+            executor.submit(_score_shard, shard, batch_size, list(self._sources))
+            for shard in shards
+        ]
+        results: List[ScoreDict] = []
+        for future in futures:
+            pid, scores, worker_stats = future.result()
+            self._worker_stats[pid] = worker_stats
+            results.extend(scores)
+        self._shards += len(shards)
+        return results
+
+    def load_premise_tokens(self, source: Path) -> int:
+        if str(source) not in self._sources:
+            self._sources.append(str(source))
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        totals: Dict[str, Any] = {}
+        for worker_stats in self._worker_stats.values():
+            for key, value in worker_stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    totals[key] = totals.get(key, 0) + value
+        if totals.get("padded_tokens"):
+            totals["padding_efficiency"] = totals["tokens"] / totals["padded_tokens"]
+        return {
+            **totals,
+            "pool_workers": self.workers,
+            "pool_threads_per_worker": self.threads,
+            "pool_shards": self._shards,
+        }
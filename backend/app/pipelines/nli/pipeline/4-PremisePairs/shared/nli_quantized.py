@@ -0,0 +1,167 @@
+from __future__ import annotations
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import torch
+from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+from nli_exports import INT8_WEIGHTS_FILE_NAME, export_dir
+from paths import PipelinePaths
+from .nli_scoring import DEFAULT_MODEL_NAME, LocalNliScorer
+
+WEIGHTS_FILE_NAME = INT8_WEIGHTS_FILE_NAME
+
+MANIFEST_FILE_NAME = "quantization.json"
+
+INT8_WEIGHT_SUFFIX = ".weight_int8"
+
+INT8_SCALE_SUFFIX = ".weight_scale"
+
+_SAFETENSORS_DTYPES: Dict[str, torch.dtype] = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def int8_export_dir(model_name: str) -> Path:
+    models_dir = PipelinePaths.from_file(Path(__file__)).nli_models_dir
+    return export_dir("int8", model_name, models_dir)
+
+
+def quantize_per_channel(weight: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+    scale = weight.abs().amax(dim=1).clamp(min=1e-8) / 127.0
+    q = torch.round(weight / scale[:, None]).clamp(-127, 127).to(torch.int8)
+    return q.contiguous(), scale.to(torch.float32).contiguous()
+
+
+def mmap_safetensors(path: Path) -> Dict[str, torch.Tensor]:
+    with open(path, "rb") as fh:
+        (header_len,) = struct.unpack("<Q", fh.read(8))
+        header = json.loads(fh.read(header_len))
+    nbytes = path.stat().st_size
+    storage = torch.UntypedStorage.from_file(str(path), shared=False, nbytes=nbytes)
+    raw = torch.empty(0, dtype=torch.uint8).set_(storage)
+    base = 8 + header_len
+    tensors: Dict[str, torch.Tensor] = {}
+    for name, meta in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = _SAFETENSORS_DTYPES[meta["dtype"]]
+        start, end = meta["data_offsets"]
+        chunk = raw[base + start : base + end]
+        itemsize = torch.empty(0, dtype=dtype).element_size()
+        if (base + start) % itemsize:
+            chunk = chunk.clone()
+        tensors[name] = chunk.view(dtype).reshape(meta["shape"])
+    return tensors
+
+
+def _assign_tensor(model: torch.nn.Module, name: str, tensor: torch.Tensor) -> bool:
+    module_name, _, leaf = name.rpartition(".")
+    try:
+        module = model.get_submodule(module_name) if module_name else model
+    except AttributeError:
+        return False
+    if leaf in module._parameters:
+        module._parameters[leaf] = torch.nn.Parameter(tensor, requires_grad=False)
+        return True
+    if leaf in module._buffers:
+        module._buffers[leaf] = tensor
+        return True
+    return False
+
+
+def _int8_linear(
+    weight: torch.Tensor, scale: torch.Tensor, bias: Optional[torch.Tensor]
+) -> torch.nn.Module:
+    out_features, in_features = weight.shape
+    qweight = torch._make_per_channel_quantized_tensor(
+        weight,
+        scale.to(torch.float64),
+        torch.zeros(out_features, dtype=torch.int64),
+        0,
+    )
+    linear = torch.ao.nn.quantized.dynamic.Linear(
+        in_features, out_features, bias_=bias is not None, dtype=torch.qint8
+    )
+    linear.set_weight_bias(qweight, None if bias is None else bias.float())
+    return linear
+
+
+def load_int8_model(export_dir: Path) -> torch.nn.Module:
+    manifest = json.loads((export_dir / MANIFEST_FILE_NAME).read_text(encoding="utf-8"))
+    config = AutoConfig.from_pretrained(str(export_dir))
+    with torch.device("meta"):
+        model = AutoModelForSequenceClassification.from_config(config)
+    tensors = mmap_safetensors(export_dir / WEIGHTS_FILE_NAME)
+    quantized: List[str] = manifest["quantized_linears"]
+    for name in quantized:
+        linear = _int8_linear(
+            tensors.pop(f"{name}{INT8_WEIGHT_SUFFIX}"),
+            tensors.pop(f"{name}{INT8_SCALE_SUFFIX}"),
+            tensors.pop(f"{name}.bias", None),
+        )
+        parent_name, _, leaf = name.rpartition(".")
+        parent = model.get_submodule(parent_name) if parent_name else model
+        setattr(parent, leaf, linear)
+    unknown = [
+        name
+        for name, tensor in tensors.items()
+        if not _assign_tensor(model, name, tensor)
+    ]
+    if unknown:
+        raise RuntimeError(f"Unexpected tensors in int8 export: {unknown[:5]}")
+    missing = [
+        name
+        for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+        if tensor.is_meta
+    ]
+    if missing:
+        raise RuntimeError(f"Int8 export is missing tensors: {missing[:5]}")
+    model.eval()
+    return model
+
+
+class QuantizedNliScorer(LocalNliScorer):
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        batch_size: Optional[int] = None,
+        export_dir: Optional[Path] = None,
+        num_threads: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            model_name=model_name, batch_size=batch_size, num_threads=num_threads
+        )
+        self.backend = "int8"
+        self.export_dir = export_dir or int8_export_dir(model_name)
+
+    @property
+    def cache_namespace(self) -> str:
+        return f"{self.model_name}@int8"
+
+    def _ensure_model(self) -> tuple[AutoTokenizer, Any]:
+        if self._tokenizer is None or self._model is None:
+            if not (self.export_dir / WEIGHTS_FILE_NAME).exists():
+                raise FileNotFoundError(
+                    f"Int8 weights missing: {self.export_dir / WEIGHTS_FILE_NAME}. "
+                    "Lauf zuerst 4-PremisePairs/nli_quantize.py prepare."
+                )
+            print(f"➡️ Lade NLI-Modell (int8, mmap): {self.export_dir}")
+            torch.backends.quantized.engine = (
+                "fbgemm"
+                if "fbgemm" in torch.backends.quantized.supported_engines
+                else torch.backends.quantized.engine
+            )
+            self._model = load_int8_model(self.export_dir)
+            self._tokenizer = AutoTokenizer.from_pretrained(str(self.export_dir))
+            self._id2label = dict(self._model.config.id2label)
+        return self._tokenizer, self._model
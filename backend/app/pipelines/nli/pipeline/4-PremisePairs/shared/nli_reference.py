@@ -0,0 +1,90 @@
+from __future__ import annotations
+import random
+from typing import List
+from .nli_scoring import ScorePair
+
+REFERENCE_PAIRS: List[ScorePair] = [
+    (
+        "iPhone revenue in Greater China is forecast to decline by 8% in 2025.",
+        "Apple should expand iPhone sales in Greater China.",
+    ),
+    (
+        "The wearables market in Europe is projected to grow steadily until 2028.",
+        "Demand for Apple Watch in Europe will increase.",
+    ),
+    (
+        "Export restrictions could disrupt the supply of components manufactured in China.",
+        "Apple can rely on a stable supply chain in Asia.",
+    ),
+    (
+        "Services revenue reached a record high driven by the App Store and iCloud.",
+        "Apple's services segment is growing.",
+    ),
+    (
+        "Mac shipments in the Americas fell for the third consecutive quarter.",
+        "Apple should raise Mac prices in the Americas.",
+    ),
+    (
+        "Smartphone penetration in Japan is close to saturation.",
+        "There is significant room for new smartphone customers in Japan.",
+    ),
+    ("Tablets", "Apple should invest in the iPad."),
+    (
+        "Regulators in the European Union may require alternative app marketplaces, "
+        "which could reduce commission income from the App Store over the coming years.",
+        "Apple's App Store commissions in Europe will remain unchanged.",
+    ),
+]
+
+LABELS = ("ENTAILMENT", "CONTRADICTION", "NEUTRAL")
+
+
+def verdict(scores: dict) -> str:
+    return max(LABELS, key=lambda label: scores.get(label, 0.0))
+
+
+SYNTHETIC_SEGMENTS = ("iPhone", "Mac", "iPad", "Wearables", "Services")
+
+SYNTHETIC_REGIONS = (
+    "Americas",
+    "Europe",
+    "Greater China",
+    "Japan",
+    "Rest of Asia Pacific",
+)
+
+SYNTHETIC_TRENDS = (
+    "is forecast to grow by {pct}% per year until {year}",
+    "is expected to decline by {pct}% in {year}",
+    "will remain broadly flat through {year}",
+)
+
+SYNTHETIC_CONTEXT = (
+    "Analysts attribute the development to pricing, channel inventory and "
+    "currency effects, while regulatory uncertainty and supply constraints "
+    "could shift the outlook in either direction."
+)
+
+SYNTHETIC_STRATEGIES = (
+    "Apple should expand {segment} sales in {region}.",
+    "Apple should reduce {segment} prices in {region}.",
+    "Demand for {segment} in {region} will increase.",
+)
+
+
+def synthetic_pairs(count: int, seed: int = 13) -> List[ScorePair]:
+    rng = random.Random(seed)
+    pairs: List[ScorePair] = []
+    for _ in range(count):
+        segment = rng.choice(SYNTHETIC_SEGMENTS)
+        region = rng.choice(SYNTHETIC_REGIONS)
+        trend = rng.choice(SYNTHETIC_TRENDS).format(
+            pct=rng.randint(1, 25), year=rng.randint(2025, 2030)
+        )
+        premise = f"{segment} revenue in {region} {trend}."
+        premise = " ".join([premise] + [SYNTHETIC_CONTEXT] * rng.randint(0, 4))
+        hypothesis = rng.choice(SYNTHETIC_STRATEGIES).format(
+            segment=segment, region=rng.choice((region, rng.choice(SYNTHETIC_REGIONS)))
+        )
+        pairs.append((premise, hypothesis))
+    return pairs
@@ -0,0 +1,97 @@
+from __future__ import annotations
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence
+from .nli_scoring import NliScorer, ScoreDict, ScorePair
+
+DEFAULT_WORKER_URL: Final[str] = "http://127.0.0.1:8765"
+
+DEFAULT_TIMEOUT_SECONDS: Final[float] = 600.0
+
+
+def worker_url_from_env() -> str:
+    return os.getenv("NLI_WORKER_URL", DEFAULT_WORKER_URL).rstrip("/")
+
+
+def _request_json(
+    url: str, payload: Optional[dict] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS
+) -> Dict[str, Any]:
+    data = None
+    headers = {"Accept": "application/json"}
+    if payload is not None:
+        data = json.dumps(payload).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    request = urllib.request.Request(url, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as exc:
+        detail = exc.read().decode("utf-8", errors="replace")[:300]
+        raise RuntimeError(f"NLI worker error {exc.code} at {url}: {detail}") from exc
+    except (urllib.error.URLError, OSError) as exc:
+        raise RuntimeError(f"NLI worker unreachable at {url}: {exc}") from exc
+
+
+def worker_health(url: Optional[str] = None, timeout: float = 2.0) -> Dict[str, Any]:
+    return _request_json(f"{url or worker_url_from_env()}/health", timeout=timeout)
+
+
+class RemoteNliScorer(NliScorer):
+    def __init__(
+        self, url: Optional[str] = None, model_name: Optional[str] = None
+    ) -> None:
+        self.url = (url or worker_url_from_env()).rstrip("/")
+        self.requests = 0
+        self.pairs = 0
+        self.seconds = 0.0
+        self._worker_totals: Dict[str, Any] = {}
+        if model_name is None:
+            model_name = str(worker_health(self.url).get("model_name", ""))
+        super().__init__(model_name=model_name, backend="remote")
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        return self.score_batch([(premise, hypothesis)])[0]
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        if not pairs:
+            return []
+        payload: Dict[str, Any] = {"pairs": [[p, h] for p, h in pairs]}
+        if batch_size:
+            payload["batch_size"] = batch_size
+        start = time.perf_counter()
+        response = _request_json(f"{self.url}/score", payload)
+        self.seconds += time.perf_counter() - start
+        scores = response.get("scores")
+        if not isinstance(scores, list) or len(scores) != len(pairs):
+            raise RuntimeError(
+                f"NLI worker returned {len(scores or [])} scores for {len(pairs)} pairs."
+            )
+        self.requests += 1
+        self.pairs += len(pairs)
+        self._worker_totals = response.get("stats") or {}
+        return [{k: float(v) for k, v in item.items()} for item in scores]
+
+    def load_premise_tokens(self, source: Path) -> int:
+        try:
+            response = _request_json(
+                f"{self.url}/premise-tokens", {"source": str(Path(source).resolve())}
+            )
+        except RuntimeError as exc:
+            print(f"ℹ️ NLI-Worker lädt keine Token-Sidecars ({exc}).")
+            return 0
+        return int(response.get("loaded", 0))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "remote_requests": self.requests,
+            "remote_pairs": self.pairs,
+            "remote_seconds": self.seconds,
+            "worker_url": self.url,
+            "worker_totals": self._worker_totals,
+        }
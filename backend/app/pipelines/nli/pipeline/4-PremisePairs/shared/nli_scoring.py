@@ -1,33 +1,96 @@
 from __future__ import annotations
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Final, Optional
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+import numpy as np
 import torch
 from dotenv import load_dotenv
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from token_sidecar import load_token_sidecar, text_sha
 
 load_dotenv()
 
 ScoreDict = Dict[str, float]
 
+ScorePair = Tuple[str, str]
+
 DEFAULT_MODEL_NAME: Final[str] = "microsoft/deberta-large-mnli"
 
+DEFAULT_BATCH_SIZE: Final[int] = 16
+
+MAX_LENGTH: Final[int] = 512
+
+
+def _batch_size_from_env() -> int:
+    try:
+        return max(1, int(os.getenv("NLI_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+    except ValueError:
+        return DEFAULT_BATCH_SIZE
+
+
+def _num_threads_from_env() -> Optional[int]:
+    try:
+        return max(1, int(os.getenv("NLI_NUM_THREADS", "")))
+    except ValueError:
+        return None
+
 
 class NliScorer(ABC):
     def __init__(self, *, model_name: str, backend: str) -> None:
         self.model_name = model_name
         self.backend = backend
 
+    @property
+    def cache_namespace(self) -> str:
+        return self.model_name
+
     @abstractmethod
     def score(self, premise: str, hypothesis: str) -> ScoreDict:
         raise NotImplementedError
 
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        return [self.score(premise, hypothesis) for premise, hypothesis in pairs]
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def load_premise_tokens(self, source: Path) -> int:
+        return 0
+
+
+def _to_score_dict(probs: Sequence[float], id2label: Dict[int, str]) -> ScoreDict:
+    mapping = {id2label[i].upper(): probs[i] for i in range(len(probs))}
+    return {
+        "CONTRADICTION": float(mapping.get("CONTRADICTION", 0.0)),
+        "ENTAILMENT": float(mapping.get("ENTAILMENT", 0.0)),
+        "NEUTRAL": float(mapping.get("NEUTRAL", 0.0)),
+    }
+
 
 class LocalNliScorer(NliScorer):
-    def __init__(self, model_name: str = DEFAULT_MODEL_NAME) -> None:
+    tensor_type: str = "pt"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        batch_size: Optional[int] = None,
+        num_threads: Optional[int] = None,
+    ) -> None:
         super().__init__(model_name=model_name, backend="local")
+        self.batch_size = batch_size or _batch_size_from_env()
+        self.num_threads = num_threads
         self._tokenizer: Optional[AutoTokenizer] = None
         self._model: Optional[AutoModelForSequenceClassification] = None
+        self._id2label: Dict[int, str] = {}
+        self._batches = 0
+        self._tokens = 0
+        self._padded_tokens = 0
+        self._premise_tokens: Dict[str, List[int]] = {}
+        self._pretokenized_pairs = 0
 
     def _ensure_model(self) -> tuple[AutoTokenizer, AutoModelForSequenceClassification]:
         if self._tokenizer is None or self._model is None:
@@ -37,40 +100,228 @@ class LocalNliScorer(NliScorer):
                 self.model_name
             )
             self._model.eval()
+            self._id2label = dict(self._model.config.id2label)
         return self._tokenizer, self._model
 
-    def score(self, premise: str, hypothesis: str) -> ScoreDict:
-        tokenizer, model = self._ensure_model()
-        encoded = tokenizer(
-            premise,
-            hypothesis,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512,
-        )
+    def _apply_threads(self) -> None:
+        if self.num_threads and torch.get_num_threads() != self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+    def _predict_probs(self, encoded: Any) -> List[List[float]]:
         with torch.inference_mode():
-            logits = model(**encoded).logits[0]
-        probs = torch.softmax(logits, dim=-1).tolist()
-        id2label = model.config.id2label
-        mapping = {id2label[i].upper(): probs[i] for i in range(len(probs))}
+            logits = self._model(**encoded).logits
+        return torch.softmax(logits, dim=-1).tolist()
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        return self.score_batch([(premise, hypothesis)])[0]
+
+    def _max_length(self, tokenizer: AutoTokenizer) -> int:
+        model_max = getattr(tokenizer, "model_max_length", MAX_LENGTH) or MAX_LENGTH
+        return min(MAX_LENGTH, int(model_max))
+
+    def load_premise_tokens(self, source: Path) -> int:
+        tokens = load_token_sidecar(source, self.model_name)
+        self._premise_tokens.update(tokens)
+        return len(tokens)
+
+    def _encode_pairs(
+        self, tokenizer: AutoTokenizer, pairs: Sequence[ScorePair], max_length: int
+    ) -> List[Dict[str, List[int]]]:
+        encodings: List[Optional[Dict[str, List[int]]]] = [None] * len(pairs)
+        if self._premise_tokens:
+            hypotheses = list(dict.fromkeys(hypothesis for _, hypothesis in pairs))
+            hyp_ids = dict(
+                zip(
+                    hypotheses,
+                    tokenizer(hypotheses, add_special_tokens=False)["input_ids"],
+                )
+            )
+            budget = max_length - tokenizer.num_special_tokens_to_add(pair=True)
+            for idx, (premise, hypothesis) in enumerate(pairs):
+                premise_ids = self._premise_tokens.get(text_sha(premise))
+                if premise_ids is None:
+                    continue
+                if len(premise_ids) + len(hyp_ids[hypothesis]) > budget:
+                    continue
+                input_ids = tokenizer.build_inputs_with_special_tokens(
+                    premise_ids, hyp_ids[hypothesis]
+                )
+                encodings[idx] = {
+                    "input_ids": input_ids,
+                    "token_type_ids": tokenizer.create_token_type_ids_from_sequences(
+                        premise_ids, hyp_ids[hypothesis]
+                    ),
+                    "attention_mask": [1] * len(input_ids),
+                }
+            self._pretokenized_pairs += sum(1 for enc in encodings if enc is not None)
+        missing = [idx for idx, enc in enumerate(encodings) if enc is None]
+        if missing:
+            encoded = tokenizer(
+                [pairs[idx][0] for idx in missing],
+                [pairs[idx][1] for idx in missing],
+                truncation=True,
+                max_length=max_length,
+            )
+            for pos, idx in enumerate(missing):
+                encodings[idx] = {key: encoded[key][pos] for key in encoded.keys()}
+        return [enc for enc in encodings if enc is not None]
+
+    def _collate(
+        self, tokenizer: AutoTokenizer, encodings: List[Dict[str, List[int]]]
+    ) -> Dict[str, Any]:
+        width = max(len(enc["input_ids"]) for enc in encodings)
+        pad_values = {
+            "input_ids": tokenizer.pad_token_id or 0,
+            "token_type_ids": tokenizer.pad_token_type_id,
+            "attention_mask": 0,
+        }
+        batch: Dict[str, Any] = {}
+        for key in tokenizer.model_input_names:
+            array = np.full((len(encodings), width), pad_values.get(key, 0), np.int64)
+            for row, enc in enumerate(encodings):
+                values = enc.get(key)
+                if values is None:
+                    continue
+                if tokenizer.padding_side == "left":
+                    array[row, width - len(values) :] = values
+                else:
+                    array[row, : len(values)] = values
+            batch[key] = torch.from_numpy(array) if self.tensor_type == "pt" else array
+        return batch
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        if not pairs:
+            return []
+        tokenizer, _ = self._ensure_model()
+        self._apply_threads()
+        size = max(1, batch_size or self.batch_size)
+        encodings = self._encode_pairs(tokenizer, pairs, self._max_length(tokenizer))
+        lengths = [len(enc["input_ids"]) for enc in encodings]
+        results: List[Optional[ScoreDict]] = [None] * len(pairs)
+        for bucket in plan_length_buckets(lengths, size):
+            batch = self._collate(tokenizer, [encodings[idx] for idx in bucket])
+            probs = self._predict_probs(batch)
+            for idx, row in zip(bucket, probs):
+                results[idx] = _to_score_dict(row, self._id2label)
+            bucket_max = max(lengths[idx] for idx in bucket)
+            self._batches += 1
+            self._tokens += sum(lengths[idx] for idx in bucket)
+            self._padded_tokens += bucket_max * len(bucket)
+        return [row for row in results if row is not None]
+
+    def stats(self) -> Dict[str, Any]:
         return {
-            "CONTRADICTION": float(mapping.get("CONTRADICTION", 0.0)),
-            "ENTAILMENT": float(mapping.get("ENTAILMENT", 0.0)),
-            "NEUTRAL": float(mapping.get("NEUTRAL", 0.0)),
+            "batches": self._batches,
+            "tokens": self._tokens,
+            "padded_tokens": self._padded_tokens,
+            "padding_efficiency": (
+                (self._tokens / self._padded_tokens) if self._padded_tokens else 1.0
+            ),
+            "pretokenized_pairs": self._pretokenized_pairs,
         }
 
 
-def _model_name_from_env() -> str:
+def plan_length_buckets(lengths: Sequence[int], batch_size: int) -> List[List[int]]:
+    order = sorted(range(len(lengths)), key=lambda idx: lengths[idx])
+    size = max(1, batch_size)
+    return [order[start : start + size] for start in range(0, len(order), size)]
+
+
+def model_name_from_env() -> str:
     return os.getenv("NLI_MODEL_NAME", DEFAULT_MODEL_NAME)
 
 
+def _backend_from_env() -> str:
+    return os.getenv("NLI_BACKEND", "local").strip().lower() or "local"
+
+
+def _with_cache(scorer: NliScorer) -> NliScorer:
+    from .nli_cache import (
+        CachedNliScorer,
+        NliResultCache,
+        cache_enabled_from_env,
+        cache_path_from_env,
+        max_entries_from_env,
+    )
+
+    if not cache_enabled_from_env():
+        return scorer
+    cache = NliResultCache(cache_path_from_env(), max_entries_from_env())
+    return CachedNliScorer(scorer, cache)
+
+
+def build_model_scorer(
+    backend: str,
+    model_name: str,
+    cached: bool = True,
+    pooled: bool = True,
+    num_threads: Optional[int] = None,
+) -> NliScorer:
+    backend = backend.lower()
+    wrap = _with_cache if cached else (lambda scorer: scorer)
+    if backend == "remote":
+        from .nli_remote import RemoteNliScorer
+
+        return RemoteNliScorer()
+    if backend not in {"local", "onnx", "int8"}:
+        raise ValueError(
+            f"Unknown NLI_BACKEND '{backend}' (expected local, onnx, int8, remote or cascade)."
+        )
+    from .nli_autotune import tuned_settings
+    from .nli_pool import PooledNliScorer, pool_workers_from_env
+
+    workers = pool_workers_from_env() if pooled else 1
+    if workers > 1:
+        return wrap(PooledNliScorer(backend, model_name, workers))
+    num_threads = num_threads or _num_threads_from_env()
+    tuned = tuned_settings(backend, model_name, tune_threads=num_threads is None)
+    options: Dict[str, Any] = {
+        "model_name": model_name,
+        "batch_size": tuned.get("batch_size"),
+        "num_threads": num_threads or tuned.get("num_threads"),
+    }
+    if backend == "onnx":
+        from .nli_onnx import OnnxNliScorer
+
+        return wrap(OnnxNliScorer(**options))
+    if backend == "int8":
+        from .nli_quantized import QuantizedNliScorer
+
+        return wrap(QuantizedNliScorer(**options))
+    return wrap(LocalNliScorer(**options))
+
+
+def build_nli_scorer(
+    backend: Optional[str] = None, microbatch: Optional[bool] = None
+) -> NliScorer:
+    from .nli_batching import MicroBatchingNliScorer, microbatch_enabled_from_env
+
+    backend = (backend or _backend_from_env()).lower()
+    if backend == "cascade":
+        from .nli_cascade import build_cascade_scorer
+
+        scorer = build_cascade_scorer()
+    else:
+        scorer = build_model_scorer(backend, model_name_from_env())
+    if microbatch is None:
+        microbatch = microbatch_enabled_from_env()
+    if microbatch and backend != "remote":
+        return MicroBatchingNliScorer(scorer)
+    return scorer
+
+
 _NLI_SCORER: Optional[NliScorer] = None
 
+_NLI_SCORER_LOCK = threading.Lock()
+
 
 def get_nli_scorer() -> NliScorer:
     global _NLI_SCORER
-    if _NLI_SCORER is None:
-        _NLI_SCORER = LocalNliScorer(model_name=_model_name_from_env())
+    with _NLI_SCORER_LOCK:
+        if _NLI_SCORER is None:
+            _NLI_SCORER = build_nli_scorer()
     return _NLI_SCORER
 
 
@@ -0,0 +1,262 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Final, Optional, Sequence, Tuple
+import numpy as np
+from embedding_providers import (
+    DEFAULT_PROVIDER,
+    EmbeddingProvider,
+    embedding_model_from_env,
+    get_embedding_provider,
+    provider_name_from_env,
+)
+from paths import PipelinePaths
+from vector_store import IndexVectors
+from .nli_reference import LABELS
+
+DEFAULT_EMBEDDING_PROVIDER: Final[str] = provider_name_from_env()
+
+DEFAULT_EMBEDDING_MODEL: Final[str] = embedding_model_from_env()
+
+RELEVANCE_THRESHOLD: Final[float] = 0.15
+
+RELEVANT_LABELS: Final[Tuple[int, ...]] = (
+    LABELS.index("ENTAILMENT"),
+    LABELS.index("CONTRADICTION"),
+)
+
+
+def surrogate_path_from_env() -> Path:
+    configured = os.getenv("NLI_SURROGATE_PATH")
+    if configured:
+        return Path(configured).resolve()
+    return PipelinePaths.from_file(Path(__file__)).nli_surrogate_file
+
+
+def surrogate_top_n_from_env() -> int:
+    try:
+        return max(0, int(os.getenv("NLI_SURROGATE_TOP_N", "0")))
+    except ValueError:
+        return 0
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype="float32")
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12
+    return vectors / norms
+
+
+def pair_features(hyp: np.ndarray, prem: np.ndarray) -> np.ndarray:
+    return np.hstack([hyp, prem, hyp * prem, np.abs(hyp - prem)]).astype("float32")
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def embed_texts(
+    texts: Sequence[str], provider: EmbeddingProvider, batch_size: int = 64
+) -> np.ndarray:
+    from query_embeddings import cached_embeddings
+
+    return normalize(cached_embeddings(provider, list(texts), batch_size))
+
+
+class SurrogateNliModel:
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+        metrics: Optional[Dict[str, Any]] = None,
+        embedding_provider: str = DEFAULT_EMBEDDING_PROVIDER,
+    ) -> None:
+        self.weights = np.asarray(weights, dtype="float32")
+        self.bias = np.asarray(bias, dtype="float32")
+        self.embedding_model = embedding_model
+        self.embedding_provider = embedding_provider
+        self.metrics = metrics or {}
+
+    @property
+    def dim(self) -> int:
+        return int(self.weights.shape[0] // 4)
+
+    def embedder(self) -> EmbeddingProvider:
+        provider = get_embedding_provider(
+            self.embedding_model,
+            timeout=30,
+            provider=self.embedding_provider,
+            dims=self.dim,
+        )
+        if provider.dims is not None and provider.dims != self.dim:
+            raise ValueError(
+                f"{provider.name} embedding dimension {provider.dims} "
+                f"!= surrogate dimension {self.dim}"
+            )
+        return provider
+
+    def predict(self, hyp: np.ndarray, premises: np.ndarray) -> np.ndarray:
+        d = self.dim
+        w = self.weights
+        logits = (
+            hyp @ w[:d]
+            + premises @ w[d : 2 * d]
+            + (premises * hyp) @ w[2 * d : 3 * d]
+            + np.abs(premises - hyp) @ w[3 * d :]
+            + self.bias
+        )
+        return _softmax(logits)
+
+    def relevance(self, hyp: np.ndarray, premises: np.ndarray) -> np.ndarray:
+        probs = self.predict(hyp, premises)
+        return probs[:, list(RELEVANT_LABELS)].max(axis=1)
+
+    def top_n(self, hyp: np.ndarray, premises: np.ndarray, n: int) -> np.ndarray:
+        scores = self.relevance(hyp, premises)
+        if n >= len(scores):
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, n)[:n]
+        return top[np.argsort(-scores[top])]
+
+    @classmethod
+    def fit(
+        cls,
+        hyp: np.ndarray,
+        prem: np.ndarray,
+        targets: np.ndarray,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+        embedding_provider: str = DEFAULT_EMBEDDING_PROVIDER,
+        epochs: int = 200,
+        learning_rate: float = 0.01,
+        l2: float = 1e-4,
+        batch_size: int = 1024,
+        seed: int = 13,
+    ) -> "SurrogateNliModel":
+        rng = np.random.default_rng(seed)
+        features = hyp.shape[1] * 4
+        weights = np.zeros((features, len(LABELS)), dtype="float32")
+        prior = np.clip(targets.mean(axis=0), 1e-6, None)
+        bias = np.log(prior / prior.sum()).astype("float32")
+        params = [weights, bias]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        step = 0
+        for _ in range(epochs):
+            order = rng.permutation(len(targets))
+            for start in range(0, len(order), batch_size):
+                idx = order[start : start + batch_size]
+                x = pair_features(hyp[idx], prem[idx])
+                grad_logits = (_softmax(x @ weights + bias) - targets[idx]) / len(idx)
+                grads = [x.T @ grad_logits + l2 * weights, grad_logits.sum(axis=0)]
+                step += 1
+                for param, grad, m, v in zip(params, grads, moments, velocities):
+                    m *= 0.9
+                    m += 0.1 * grad
+                    v *= 0.999
+                    v += 0.001 * grad * grad
+                    m_hat = m / (1 - 0.9**step)
+                    v_hat = v / (1 - 0.999**step)
+                    param -= learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)
+        return cls(
+            weights, bias, embedding_model, embedding_provider=embedding_provider
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "embedding_provider": self.embedding_provider,
+            "embedding_model": self.embedding_model,
+            "embedding_dims": self.dim,
+            "labels": list(LABELS),
+            "metrics": self.metrics,
+        }
+        with path.open("wb") as handle:
+            np.savez(
+                handle, weights=self.weights, bias=self.bias, meta=json.dumps(meta)
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "SurrogateNliModel":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            provider = meta.get("embedding_provider", DEFAULT_PROVIDER)
+            model = cls(
+                data["weights"],
+                data["bias"],
+                meta.get("embedding_model", embedding_model_from_env(provider)),
+                meta.get("metrics"),
+                embedding_provider=provider,
+            )
+        dims = meta.get("embedding_dims")
+        if dims is not None and int(dims) != model.dim:
+            raise ValueError(
+                f"surrogate metadata dimension {dims} != weight dimension {model.dim}"
+            )
+        return model
+
+
+def surrogate_candidates(
+    hypotheses: Sequence[str],
+    premise_texts: Sequence[str],
+    index_file: Path,
+    meta_file: Path,
+    text_col: str,
+    top_n: Optional[int] = None,
+) -> Tuple[Optional[Dict[str, set]], Dict[str, Any]]:
+    top_n = surrogate_top_n_from_env() if top_n is None else top_n
+    stats: Dict[str, Any] = {"enabled": False, "top_n": top_n}
+    if top_n <= 0:
+        return None, stats
+    model_file = surrogate_path_from_env()
+    if not model_file.exists():
+        stats["reason"] = f"surrogate model missing: {model_file}"
+        print(f"ℹ️ Surrogate-Vorfilter übersprungen ({stats['reason']}).")
+        return None, stats
+    try:
+        model = SurrogateNliModel.load(model_file)
+        provider = model.embedder()
+        unavailable = provider.unavailable_reason()
+        if unavailable is None:
+            vectors = IndexVectors.from_index(index_file, meta_file, text_col)
+            if vectors.dim != model.dim:
+                raise ValueError(
+                    f"index dimension {vectors.dim} != surrogate dimension {model.dim}"
+                )
+            hyp_vecs = embed_texts(list(hypotheses), provider)
+    except Exception as exc:
+        stats["reason"] = str(exc)
+        print(f"⚠️ Surrogate-Vorfilter nicht verfügbar ({exc}); bewerte alle Paare.")
+        return None, stats
+    if unavailable is not None:
+        stats["reason"] = f"{unavailable} for hypothesis embeddings"
+        print(f"ℹ️ Surrogate-Vorfilter übersprungen ({stats['reason']}).")
+        return None, stats
+    prem_vecs, found = vectors.lookup(list(premise_texts))
+    known = np.flatnonzero(found)
+    unknown = set(np.flatnonzero(~found).tolist())
+    selected: Dict[str, set] = {}
+    for hypothesis, hyp_vec in zip(hypotheses, hyp_vecs):
+        keep = set(unknown)
+        if len(known):
+            top = model.top_n(hyp_vec, prem_vecs[known], top_n)
+            keep.update(known[top].tolist())
+        selected[hypothesis] = keep
+    total = len(selected) * len(premise_texts)
+    kept = sum(len(keep) for keep in selected.values())
+    stats.update(
+        {
+            "enabled": True,
+            "model_file": str(model_file),
+            "candidate_pairs": total,
+            "kept_pairs": kept,
+            "premises_without_vector": len(unknown),
+        }
+    )
+    print(
+        f"ℹ️ Surrogate-Vorfilter: {kept}/{total} Paare gehen an den Cross-Encoder "
+        f"(Top-{top_n} je Hypothese)."
+    )
+    return selected, stats
@@ -12,6 +12,7 @@ PIPELINE_ROOT = BASE_DIR.parent
 sys.path.insert(0, str(PIPELINE_ROOT))
 
 from paths import PipelinePaths
+from retrieval_filters import region_compatible, segment_compatible
 
 PATHS = PipelinePaths.from_file(Path(__file__))
 
@@ -144,45 +145,11 @@ def _filter_by_score(
 
 
 def _filter_region_mismatch(pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    def _normalize(region: str) -> str:
-        normalized = region.strip().lower()
-        aliases = {
-            "eu": "europe",
-            "emea": "europe",
-            "european union": "europe",
-            "apac": "apac",
-            "asia pacific": "apac",
-            "rest of asia pacific": "apac",
-            "china": "greater china",
-            "prc": "greater china",
-            "greater china": "greater china",
-            "hong kong": "greater china",
-            "taiwan": "greater china",
-            "macau": "greater china",
-            "usa": "americas",
-            "us": "americas",
-            "united states": "americas",
-            "north america": "americas",
-            "america": "americas",
-            "americas": "americas",
-            "all": "any",
-            "global": "any",
-            "world": "any",
-            "worldwide": "any",
-        }
-        return aliases.get(normalized, normalized)
-
-    filtered: List[Dict[str, Any]] = []
-    for pair in pairs:
-        strategy_region = pair.get("strategy_region")
-        pair_region = pair.get("region")
-        if isinstance(strategy_region, str) and isinstance(pair_region, str):
-            g_norm = _normalize(strategy_region)
-            p_norm = _normalize(pair_region)
-            if p_norm != "any" and g_norm != "any" and g_norm != p_norm:
-                continue
-        filtered.append(pair)
-    return filtered
+    return [
+        pair
+        for pair in pairs
+        if region_compatible(pair.get("strategy_region"), pair.get("region"))
+    ]
 
 
 def _limit_per_source(
@@ -275,37 +242,11 @@ def _prune_fields(pair: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _filter_segment_mismatch(pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    def _normalize(segment: str) -> str:
-        normalized = segment.strip().lower()
-        aliases = {
-            "iphone": "iphone",
-            "smartphones": "smartphones",
-            "smartphone": "smartphones",
-            "tablet": "tablet",
-            "tablets": "tablet",
-            "mac": "mac",
-            "pc": "mac",
-            "watch": "watch",
-            "wearables": "wearables",
-            "services": "services",
-            "appstore": "services",
-            "app store": "services",
-            "all": "any",
-            "any": "any",
-        }
-        return aliases.get(normalized, normalized)
-
-    filtered: List[Dict[str, Any]] = []
-    for pair in pairs:
-        strategy_segment = pair.get("strategy_segment")
-        pair_segment = pair.get("segment")
-        if isinstance(strategy_segment, str) and isinstance(pair_segment, str):
-            g_norm = _normalize(strategy_segment)
-            p_norm = _normalize(pair_segment)
-            if p_norm != "any" and g_norm != "any" and g_norm != p_norm:
-                continue
-        filtered.append(pair)
-    return filtered
+    return [
+        pair
+        for pair in pairs
+        if segment_compatible(pair.get("strategy_segment"), pair.get("segment"))
+    ]
 
 
 def merge_pairs() -> None:
@@ -0,0 +1,224 @@
+from __future__ import annotations
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from paths import PipelinePaths
+from token_sidecar import text_sha, tokenizer_slug
+
+DEFAULT_DIMS = 1536
+
+DTYPES = {"float16", "float32"}
+
+
+def embedding_cache_enabled_from_env() -> bool:
+    return os.getenv("EMBED_CACHE", "true").strip().lower() not in {"0", "false", "no"}
+
+
+def embedding_cache_dir_from_env() -> Path:
+    configured = os.getenv("EMBED_CACHE_DIR")
+    if configured:
+        return Path(configured).resolve()
+    return PipelinePaths.from_file(Path(__file__)).embedding_cache_dir
+
+
+def embedding_dims_from_env() -> int:
+    try:
+        return int(os.getenv("EMBED_MODEL_DIM", DEFAULT_DIMS))
+    except ValueError:
+        return DEFAULT_DIMS
+
+
+def embedding_dtype_from_env() -> str:
+    dtype = os.getenv("EMBED_CACHE_DTYPE", "float32").strip().lower()
+    return dtype if dtype in DTYPES else "float32"
+
+
+def _existing_dims(root: Path, model: str) -> Optional[int]:
+    dims = []
+    for meta_file in root.glob(f"{tokenizer_slug(model)}-*/meta.json"):
+        try:
+            meta = json.loads(meta_file.read_text())
+        except (OSError, ValueError):
+            continue
+        if meta.get("model") == model and isinstance(meta.get("dims"), int):
+            dims.append(meta["dims"])
+    return dims[0] if len(dims) == 1 else None
+
+
+class EmbeddingCache:
+    def __init__(
+        self, root: Path, model: str, dims: Optional[int], dtype: str = "float32"
+    ) -> None:
+        self.root = root
+        self.model = model
+        self.dtype = np.dtype(dtype)
+        self.dims: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._count = 0
+        self._ids_offset = 0
+        self._loaded = False
+        self._vectors: Optional[np.memmap] = None
+        self.hits = 0
+        self.misses = 0
+        dims = dims or _existing_dims(root, model)
+        if dims:
+            self._bind(dims)
+
+    def _bind(self, dims: int) -> None:
+        self.dims = dims
+        self.dir = self.root / f"{tokenizer_slug(self.model)}-{dims}"
+        self.ids_file = self.dir / "ids.txt"
+        self.vectors_file = self.dir / f"vectors.{self.dtype.name}.bin"
+        self.meta_file = self.dir / "meta.json"
+        self.lock_file = self.dir / ".lock"
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self.lock_file.open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _row_bytes(self) -> int:
+        return self.dims * self.dtype.itemsize
+
+    def _map(self) -> None:
+        self._vectors = (
+            np.memmap(self.vectors_file, dtype=self.dtype, mode="r").reshape(
+                self._count, self.dims
+            )
+            if self._count
+            else None
+        )
+
+    def _reload(self) -> None:
+        ids: List[str] = []
+        if self.ids_file.exists():
+            ids = [line for line in self.ids_file.read_text().splitlines() if line]
+        size = self.vectors_file.stat().st_size if self.vectors_file.exists() else 0
+        rows = min(len(ids), size // self._row_bytes())
+        if size != rows * self._row_bytes():
+            with self.vectors_file.open("r+b") as handle:
+                handle.truncate(rows * self._row_bytes())
+        if rows != len(ids):
+            ids = ids[:rows]
+            self.ids_file.write_text("".join(f"{sha}\n" for sha in ids))
+        self._rows = {sha: row for row, sha in enumerate(ids)}
+        self._count = rows
+        self._ids_offset = self.ids_file.stat().st_size if self.ids_file.exists() else 0
+        self._loaded = True
+        self._map()
+
+    def _refresh(self) -> None:
+        if (
+            not self._loaded
+            or not self.ids_file.exists()
+            or not self.vectors_file.exists()
+        ):
+            self._reload()
+            return
+        size = self.ids_file.stat().st_size
+        if size == self._ids_offset:
+            return
+        if size < self._ids_offset:
+            self._reload()
+            return
+        with self.ids_file.open("rb") as handle:
+            handle.seek(self._ids_offset)
+            appended = handle.read().decode("utf-8")
+        new_ids = [line for line in appended.splitlines() if line]
+        vector_rows = self.vectors_file.stat().st_size // self._row_bytes()
+        if not appended.endswith("\n") or self._count + len(new_ids) != vector_rows:
+            self._reload()
+            return
+        for sha in new_ids:
+            self._rows[sha] = self._count
+            self._count += 1
+        self._ids_offset = size
+        self._map()
+
+    def lookup(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        if self.dims is None:
+            self.misses += len(texts)
+            return np.zeros((len(texts), 0), dtype="float32"), np.zeros(
+                len(texts), dtype=bool
+            )
+        if not self._loaded:
+            with self._locked():
+                self._reload()
+        rows = np.array(
+            [self._rows.get(text_sha(text), -1) for text in texts], dtype=np.int64
+        )
+        found = rows >= 0
+        vectors = np.zeros((len(texts), self.dims), dtype="float32")
+        if found.any():
+            vectors[found] = self._vectors[rows[found]]
+        self.hits += int(found.sum())
+        self.misses += int((~found).sum())
+        return vectors, found
+
+    def add(self, texts: Sequence[str], vectors: np.ndarray) -> int:
+        vectors = np.asarray(vectors, dtype="float32")
+        if vectors.ndim != 2:
+            return 0
+        if self.dims is None:
+            self._bind(vectors.shape[1])
+        if vectors.shape[1] != self.dims:
+            print(
+                f"⚠️ Embedding-Cache übersprungen: Dimension {vectors.shape[-1]} "
+                f"statt {self.dims}."
+            )
+            return 0
+        with self._locked():
+            self._refresh()
+            fresh: Dict[str, np.ndarray] = {}
+            for text, vector in zip(texts, vectors):
+                sha = text_sha(text)
+                if sha not in self._rows:
+                    fresh.setdefault(sha, vector)
+            if fresh:
+                with self.vectors_file.open("ab") as handle:
+                    handle.write(
+                        np.vstack(list(fresh.values())).astype(self.dtype).tobytes()
+                    )
+                with self.ids_file.open("a") as handle:
+                    handle.write("".join(f"{sha}\n" for sha in fresh))
+                if not self.meta_file.exists():
+                    self.meta_file.write_text(
+                        json.dumps(
+                            {
+                                "model": self.model,
+                                "dims": self.dims,
+                                "dtype": self.dtype.name,
+                            }
+                        )
+                    )
+                for sha in fresh:
+                    self._rows[sha] = self._count
+                    self._count += 1
+                self._ids_offset = self.ids_file.stat().st_size
+                self._map()
+        return len(fresh)
+
+
+_CACHES: Dict[Tuple[str, Optional[int]], EmbeddingCache] = {}
+
+
+def get_embedding_cache(
+    model: str, dims: Optional[int] = None
+) -> Optional[EmbeddingCache]:
+    if not embedding_cache_enabled_from_env():
+        return None
+    key = (model, dims)
+    if key not in _CACHES:
+        _CACHES[key] = EmbeddingCache(
+            embedding_cache_dir_from_env(), model, dims, embedding_dtype_from_env()
+        )
+    return _CACHES[key]
@@ -0,0 +1,254 @@
+from __future__ import annotations
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from embedding_cache import embedding_dims_from_env
+from token_sidecar import text_sha
+
+DEFAULT_PROVIDER = "openai"
+
+DEFAULT_MODELS: Dict[str, str] = {
+    "openai": "text-embedding-3-small",
+    "local": "sentence-transformers/all-MiniLM-L6-v2",
+    "hash": "hashing-v1",
+}
+
+OPENAI_MODEL_DIMS: Dict[str, int] = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+MAX_INPUTS_PER_REQUEST = 2048
+
+LOCAL_BATCH_SIZE = 32
+
+DEFAULT_CONCURRENCY = 4
+
+LOCAL_MAX_LENGTH = 512
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype="float32")
+    return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+
+
+def provider_name_from_env() -> str:
+    return os.getenv("EMBED_PROVIDER", DEFAULT_PROVIDER).strip().lower() or "openai"
+
+
+def embedding_model_from_env(provider: Optional[str] = None) -> str:
+    provider = provider or provider_name_from_env()
+    return os.getenv("EMBED_MODEL") or DEFAULT_MODELS.get(provider, "")
+
+
+class EmbeddingProvider(ABC):
+    name: str = ""
+    batch_size: int = MAX_INPUTS_PER_REQUEST
+    max_concurrency: int = 1
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.name}-{self.model}"
+
+    @property
+    def dims(self) -> Optional[int]:
+        return None
+
+    def unavailable_reason(self) -> Optional[str]:
+        return None
+
+    @abstractmethod
+    def embed(
+        self, texts: Sequence[str], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        raise NotImplementedError
+
+
+def _index(item: Any) -> int:
+    return int(getattr(item, "index", 0))
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    name = "openai"
+
+    def __init__(self, model: str, timeout: Optional[float] = None) -> None:
+        super().__init__(model)
+        self.timeout = timeout
+        self._client: Any = None
+        self._dims: Optional[int] = None
+
+    @property
+    def cache_key(self) -> str:
+        return self.model
+
+    @property
+    def dims(self) -> Optional[int]:
+        return self._dims or OPENAI_MODEL_DIMS.get(self.model)
+
+    @property
+    def max_concurrency(self) -> int:
+        try:
+            return max(1, int(os.getenv("EMBED_CONCURRENCY", DEFAULT_CONCURRENCY)))
+        except ValueError:
+            return DEFAULT_CONCURRENCY
+
+    def unavailable_reason(self) -> Optional[str]:
+        return None if os.getenv("OPENAI_API_KEY") else "OPENAI_API_KEY missing"
+
+    def _ensure_client(self) -> Any:
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"), timeout=self.timeout
+            )
+        return self._client
+
+    def embed(
+        self, texts: Sequence[str], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        client = self._ensure_client()
+        size = batch_size or self.batch_size
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), size):
+            chunk = list(texts[start : start + size])
+            if len(texts) > size:
+                end = start + len(chunk) - 1
+                print(f"➡️ Embedding Batch {start}–{end} ({len(chunk)} Texte)…")
+            try:
+                resp = client.embeddings.create(model=self.model, input=chunk)
+            except Exception as exc:
+                raise RuntimeError(f"OpenAI embedding request failed: {exc}") from exc
+            vectors.extend(item.embedding for item in sorted(resp.data, key=_index))
+        result = normalize_rows(np.array(vectors, dtype="float32"))
+        if result.ndim == 2 and result.shape[1]:
+            self._dims = int(result.shape[1])
+        return result
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    name = "local"
+    batch_size = LOCAL_BATCH_SIZE
+
+    def __init__(self, model: str) -> None:
+        super().__init__(model)
+        self._tokenizer: Any = None
+        self._model: Any = None
+        self._dims: Optional[int] = None
+
+    @property
+    def dims(self) -> Optional[int]:
+        if self._dims is None:
+            from transformers import AutoConfig
+
+            self._dims = int(AutoConfig.from_pretrained(self.model).hidden_size)
+        return self._dims
+
+    def _ensure_model(self) -> Tuple[Any, Any]:
+        if self._tokenizer is None or self._model is None:
+            from transformers import AutoModel, AutoTokenizer
+
+            print(f"➡️ Lade Embedding-Modell lokal: {self.model}")
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model)
+            self._model = AutoModel.from_pretrained(self.model)
+            self._model.eval()
+        return self._tokenizer, self._model
+
+    def embed(
+        self, texts: Sequence[str], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        import torch
+
+        tokenizer, model = self._ensure_model()
+        size = batch_size or self.batch_size
+        pooled: List[np.ndarray] = []
+        for start in range(0, len(texts), size):
+            encoded = tokenizer(
+                list(texts[start : start + size]),
+                padding=True,
+                truncation=True,
+                max_length=LOCAL_MAX_LENGTH,
+                return_tensors="pt",
+            )
+            with torch.inference_mode():
+                hidden = model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            summed = (hidden * mask).sum(dim=1)
+            pooled.append((summed / mask.sum(dim=1).clamp(min=1e-9)).numpy())
+        return normalize_rows(np.vstack(pooled))
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    name = "hash"
+
+    def __init__(self, model: str, dims: Optional[int] = None) -> None:
+        super().__init__(model)
+        self._dims = dims or embedding_dims_from_env()
+
+    @property
+    def dims(self) -> int:
+        return self._dims
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self._dims, dtype="float32")
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            bucket = int(text_sha(feature)[:16], 16)
+            vector[bucket % self._dims] += 1.0 if bucket & (1 << 63) else -1.0
+        return vector
+
+    def embed(
+        self, texts: Sequence[str], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dims), dtype="float32")
+        return normalize_rows(np.vstack([self._vector(str(text)) for text in texts]))
+
+
+def build_embedding_provider(
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    timeout: Optional[float] = None,
+    dims: Optional[int] = None,
+) -> EmbeddingProvider:
+    provider = (provider or provider_name_from_env()).lower()
+    model = model or embedding_model_from_env(provider)
+    if provider == "openai":
+        return OpenAIEmbeddingProvider(model, timeout=timeout)
+    if provider == "local":
+        return LocalEmbeddingProvider(model)
+    if provider == "hash":
+        return HashingEmbeddingProvider(model, dims)
+    raise ValueError(
+        f"Unknown EMBED_PROVIDER '{provider}' (expected openai, local or hash)."
+    )
+
+
+_PROVIDERS: Dict[Tuple[str, str, Optional[float], Optional[int]], EmbeddingProvider] = (
+    {}
+)
+
+_PROVIDERS_LOCK = threading.Lock()
+
+
+def get_embedding_provider(
+    model: Optional[str] = None,
+    timeout: Optional[float] = None,
+    provider: Optional[str] = None,
+    dims: Optional[int] = None,
+) -> EmbeddingProvider:
+    provider = (provider or provider_name_from_env()).lower()
+    key = (provider, model or embedding_model_from_env(provider), timeout, dims)
+    with _PROVIDERS_LOCK:
+        if key not in _PROVIDERS:
+            _PROVIDERS[key] = build_embedding_provider(provider, key[1], timeout, dims)
+    return _PROVIDERS[key]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import Dict
+
+ONNX_FILE_NAME = "model.onnx"
+
+INT8_WEIGHTS_FILE_NAME = "model.int8.safetensors"
+
+EXPORT_FILES: Dict[str, str] = {
+    "onnx": ONNX_FILE_NAME,
+    "int8": INT8_WEIGHTS_FILE_NAME,
+}
+
+EXPORT_DIR_ENV: Dict[str, str] = {
+    "onnx": "NLI_ONNX_DIR",
+    "int8": "NLI_INT8_DIR",
+}
+
+
+def export_dir(backend: str, model_name: str, models_dir: Path) -> Path:
+    override = os.getenv(EXPORT_DIR_ENV[backend])
+    if override:
+        return Path(override).resolve()
+    slug = model_name.replace("/", "__")
+    return models_dir / f"{slug}-{backend}"
+
+
+def export_model_file(backend: str, model_name: str, models_dir: Path) -> Path:
+    return export_dir(backend, model_name, models_dir) / EXPORT_FILES[backend]
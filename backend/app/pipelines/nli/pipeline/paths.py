@@ -114,6 +114,22 @@ class PipelinePaths:
     def forecasts_parquet(self) -> Path:
         return self.preprocess_forecasts_out / "forecasts.parquet"
 
+    @property
+    def nli_cache_file(self) -> Path:
+        return self.data_root / "nli-cache" / "nli_scores.sqlite"
+
+    @property
+    def nli_models_dir(self) -> Path:
+        return self.data_root / "nli-models"
+
+    @property
+    def nli_surrogate_file(self) -> Path:
+        return self.nli_models_dir / "surrogate" / "nli_surrogate.npz"
+
+    @property
+    def embedding_cache_dir(self) -> Path:
+        return self.data_root / "embedding-cache"
+
     @property
     def embeddings_risk_retrieve_out_dir(self) -> Path:
         return self.risk_retrieve_out_dir
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Sequence
+import numpy as np
+from embedding_cache import EmbeddingCache, get_embedding_cache
+from embedding_providers import EmbeddingProvider
+
+DEFAULT_MAX_RETRIES = 4
+
+RETRY_BASE_SECONDS = 1.0
+
+
+def _max_retries_from_env() -> int:
+    try:
+        return max(0, int(os.getenv("EMBED_MAX_RETRIES", DEFAULT_MAX_RETRIES)))
+    except ValueError:
+        return DEFAULT_MAX_RETRIES
+
+
+def _embed_with_retries(
+    provider: EmbeddingProvider, texts: List[str], batch_size: int
+) -> np.ndarray:
+    retries = _max_retries_from_env()
+    attempt = 0
+    while True:
+        try:
+            return provider.embed(texts, batch_size)
+        except Exception as exc:
+            if attempt >= retries:
+                raise
+            delay = RETRY_BASE_SECONDS * 2**attempt * (1 + random.random())
+            print(
+                f"⚠️ Embedding-Batch fehlgeschlagen ({exc}); neuer Versuch in {delay:.1f}s …"
+            )
+            time.sleep(delay)
+            attempt += 1
+
+
+def embed_concurrently(
+    provider: EmbeddingProvider,
+    texts: List[str],
+    batch_size: Optional[int] = None,
+    cache: Optional[EmbeddingCache] = None,
+) -> np.ndarray:
+    size = batch_size or provider.batch_size
+    ranges = [
+        (start, min(len(texts), start + size)) for start in range(0, len(texts), size)
+    ]
+    vectors: Optional[np.ndarray] = None
+    done = 0
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, min(provider.max_concurrency, len(ranges)))
+    )
+    try:
+        futures = {
+            pool.submit(_embed_with_retries, provider, texts[start:stop], size): (
+                start,
+                stop,
+            )
+            for start, stop in ranges
+        }
+        for future in as_completed(futures):
+            start, stop = futures[future]
+            chunk = future.result()
+            if vectors is None:
+                vectors = np.empty((len(texts), chunk.shape[1]), dtype="float32")
+            vectors[start:stop] = chunk
+            if cache is not None:
+                cache.add(texts[start:stop], chunk)
+            done += stop - start
+            if len(ranges) > 1:
+                print(
+                    f"➡️ Embedding Batch {start}–{stop - 1} fertig ({done}/{len(texts)})"
+                )
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return vectors
+
+
+def _embed_unique(
+    provider: EmbeddingProvider, texts: List[str], batch_size: Optional[int]
+) -> np.ndarray:
+    unique = list(dict.fromkeys(texts))
+    vectors = embed_concurrently(provider, unique, batch_size)
+    if len(unique) == len(texts):
+        return vectors
+    rows = {text: row for row, text in enumerate(unique)}
+    return vectors[[rows[text] for text in texts]]
+
+
+def cached_embeddings(
+    provider: EmbeddingProvider,
+    texts: Sequence[str],
+    batch_size: Optional[int] = None,
+    checkpoint: Optional[Path] = None,
+) -> np.ndarray:
+    texts = [str(text) for text in texts]
+    if not texts:
+        return np.zeros((0, 0), dtype="float32")
+    cache = get_embedding_cache(provider.cache_key, provider.dims)
+    if cache is None and checkpoint is not None:
+        cache = EmbeddingCache(checkpoint, provider.cache_key, provider.dims)
+    if cache is None:
+        return _embed_unique(provider, texts, batch_size)
+    vectors, found = cache.lookup(texts)
+    missing = list(dict.fromkeys(t for t, hit in zip(texts, found) if not hit))
+    if found.any():
+        print(f"ℹ️ {int(found.sum())}/{len(texts)} Embeddings aus dem Cache.")
+    if not missing:
+        return vectors
+    if not found.any():
+        vectors = np.empty((0, 0), dtype="float32")
+    fresh = embed_concurrently(provider, missing, batch_size, cache)
+    if len(missing) == len(texts):
+        return fresh
+    if found.any() and fresh.shape[1] != cache.dims:
+        return _embed_unique(provider, texts, batch_size)
+    if not found.any():
+        vectors = np.zeros((len(texts), fresh.shape[1]), dtype="float32")
+    rows = {text: row for row, text in enumerate(missing)}
+    for pos in np.flatnonzero(~found):
+        vectors[pos] = fresh[rows[texts[pos]]]
+    return vectors
+
+
+def embed_hypotheses(
+    provider: EmbeddingProvider, hypotheses: Sequence[str]
+) -> np.ndarray:
+    return cached_embeddings(provider, hypotheses)
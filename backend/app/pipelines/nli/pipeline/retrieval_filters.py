@@ -0,0 +1,105 @@
+from __future__ import annotations
+import os
+from typing import Any, Callable, Dict, Optional, Set, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ANY_KEY = "any"
+
+FILTER_NAMES = {"region", "segment"}
+
+DEFAULT_FILTERS = "region"
+
+REGION_KEYS: Dict[str, str] = {
+    "eu": "europe",
+    "emea": "europe",
+    "european union": "europe",
+    "apac": "apac",
+    "asia pacific": "apac",
+    "rest of asia pacific": "apac",
+    "china": "greater china",
+    "prc": "greater china",
+    "greater china": "greater china",
+    "hong kong": "greater china",
+    "taiwan": "greater china",
+    "macau": "greater china",
+    "usa": "americas",
+    "us": "americas",
+    "united states": "americas",
+    "north america": "americas",
+    "america": "americas",
+    "americas": "americas",
+    "all": "any",
+    "global": "any",
+    "world": "any",
+    "worldwide": "any",
+}
+
+SEGMENT_KEYS: Dict[str, str] = {
+    "iphone": "iphone",
+    "smartphones": "smartphones",
+    "smartphone": "smartphones",
+    "tablet": "tablet",
+    "tablets": "tablet",
+    "mac": "mac",
+    "pc": "mac",
+    "watch": "watch",
+    "wearables": "wearables",
+    "services": "services",
+    "appstore": "services",
+    "app store": "services",
+    "all": "any",
+    "any": "any",
+}
+
+
+def region_key(region: str) -> str:
+    normalized = region.strip().lower()
+    return REGION_KEYS.get(normalized, normalized)
+
+
+def segment_key(segment: str) -> str:
+    normalized = segment.strip().lower()
+    return SEGMENT_KEYS.get(normalized, normalized)
+
+
+def _compatible(strategy_value: Any, value: Any, key: Callable[[str], str]) -> bool:
+    if not isinstance(strategy_value, str) or not isinstance(value, str):
+        return True
+    g_norm = key(strategy_value)
+    p_norm = key(value)
+    return p_norm == ANY_KEY or g_norm == ANY_KEY or g_norm == p_norm
+
+
+def region_compatible(strategy_region: Any, region: Any) -> bool:
+    return _compatible(strategy_region, region, region_key)
+
+
+def segment_compatible(strategy_segment: Any, segment: Any) -> bool:
+    return _compatible(strategy_segment, segment, segment_key)
+
+
+def retrieval_filters_from_env() -> Set[str]:
+    value = os.getenv("EMBED_RETRIEVAL_FILTERS", DEFAULT_FILTERS).strip().lower()
+    return {item.strip() for item in value.split(",") if item.strip()} & FILTER_NAMES
+
+
+def compatible_mask(
+    meta: "pd.DataFrame",
+    strategy: Dict[str, Any],
+    filters: Optional[Set[str]] = None,
+) -> Optional[np.ndarray]:
+    filters = retrieval_filters_from_env() if filters is None else filters
+    checks = {"region": region_compatible, "segment": segment_compatible}
+    mask: Optional[np.ndarray] = None
+    for name in sorted(filters & FILTER_NAMES):
+        wanted = strategy.get(name)
+        if name not in meta.columns or not isinstance(wanted, str):
+            continue
+        column = np.array(
+            [checks[name](wanted, value) for value in meta[name].tolist()], dtype=bool
+        )
+        mask = column if mask is None else mask & column
+    return mask
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+
+DEFAULT_TOKENIZER_NAME = "microsoft/deberta-large-mnli"
+
+TEXT_SHA_COLUMN = "text_sha"
+
+TOKEN_IDS_COLUMN = "token_ids"
+
+TOKENIZER_COLUMN = "tokenizer"
+
+
+def text_sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def tokenizer_name_from_env() -> str:
+    return os.getenv("NLI_MODEL_NAME", DEFAULT_TOKENIZER_NAME)
+
+
+def pretokenize_enabled_from_env() -> bool:
+    return os.getenv("NLI_PRETOKENIZE", "true").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+    }
+
+
+def tokenizer_slug(tokenizer_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", tokenizer_name.strip("/")) or "tokenizer"
+
+
+def token_sidecar_path(source: Path, tokenizer_name: str) -> Path:
+    return source.with_name(
+        f"{source.stem}.tokens.{tokenizer_slug(tokenizer_name)}.parquet"
+    )
+
+
+def _unique_texts(values: Iterable[object]) -> List[str]:
+    seen: Dict[str, None] = {}
+    for value in values:
+        if isinstance(value, str) and value.strip():
+            seen.setdefault(value, None)
+    return list(seen)
+
+
+def write_token_sidecar(
+    df: pd.DataFrame,
+    source: Path,
+    columns: List[str],
+    tokenizer_name: Optional[str] = None,
+) -> Optional[Path]:
+    if not pretokenize_enabled_from_env():
+        print("ℹ️ NLI_PRETOKENIZE deaktiviert; kein Token-Sidecar geschrieben.")
+        return None
+    tokenizer_name = tokenizer_name or tokenizer_name_from_env()
+    texts = _unique_texts(
+        value for col in columns if col in df.columns for value in df[col].tolist()
+    )
+    try:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+    except Exception as exc:
+        print(
+            f"⚠️ Tokenizer {tokenizer_name} nicht verfügbar ({exc}); überspringe Sidecar."
+        )
+        return None
+    encoded = tokenizer(texts, add_special_tokens=False)["input_ids"] if texts else []
+    sidecar = pd.DataFrame(
+        {
+            TEXT_SHA_COLUMN: [text_sha(text) for text in texts],
+            TOKEN_IDS_COLUMN: [list(ids) for ids in encoded],
+            TOKENIZER_COLUMN: tokenizer_name,
+        }
+    )
+    target = token_sidecar_path(source, tokenizer_name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    sidecar.to_parquet(target, index=False)
+    print(f"✅ {len(sidecar)} vortokenisierte Texte ({tokenizer_name}) → {target}")
+    return target
+
+
+def load_token_sidecar(source: Path, tokenizer_name: str) -> Dict[str, List[int]]:
+    target = token_sidecar_path(source, tokenizer_name)
+    if not target.exists():
+        return {}
+    df = pd.read_parquet(target)
+    if df.empty or TOKEN_IDS_COLUMN not in df.columns:
+        return {}
+    if TOKENIZER_COLUMN in df.columns and set(df[TOKENIZER_COLUMN]) != {tokenizer_name}:
+        return {}
+    return {
+        str(sha): [int(tok) for tok in ids]
+        for sha, ids in zip(df[TEXT_SHA_COLUMN], df[TOKEN_IDS_COLUMN])
+    }
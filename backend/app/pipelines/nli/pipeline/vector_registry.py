@@ -0,0 +1,211 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from paths import PipelinePaths
+from vector_store import configure_search, label_positions, search_filtered
+
+DEFAULT_CORPUS = "aapl_10k_2015_2025"
+
+DEFAULT_MAX_MB = 2048
+
+
+def corpus_name_from_env() -> str:
+    return os.getenv("CORPUS_NAME", DEFAULT_CORPUS).strip() or DEFAULT_CORPUS
+
+
+def max_bytes_from_env() -> int:
+    try:
+        megabytes = float(os.getenv("EMBED_STORE_MAX_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        megabytes = DEFAULT_MAX_MB
+    return int(max(0.0, megabytes) * 1024 * 1024)
+
+
+def mmap_enabled_from_env() -> bool:
+    return os.getenv("EMBED_INDEX_MMAP", "true").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+    }
+
+
+@dataclass(frozen=True)
+class Collection:
+    name: str
+    corpus: str
+    index_file: Path
+    meta_file: Path
+    id_col: Optional[str] = None
+
+
+class LoadedCollection:
+    def __init__(self, spec: Collection, index: Any, meta: pd.DataFrame) -> None:
+        if spec.id_col and spec.id_col in meta.columns:
+            meta[spec.id_col] = meta[spec.id_col].astype(str)
+        self.spec = spec
+        self.index = index
+        self.meta = meta
+        self.positions = label_positions(meta)
+        self.mtimes = _mtimes(spec)
+        self.nbytes = spec.index_file.stat().st_size + int(
+            meta.memory_usage(deep=True).sum()
+        )
+
+    def rows(self, labels: np.ndarray) -> np.ndarray:
+        if self.positions is None:
+            return labels
+        return np.array(
+            [self.positions.get(int(label), -1) for label in labels.ravel()],
+            dtype=np.int64,
+        ).reshape(labels.shape)
+
+    def search(
+        self, queries: np.ndarray, k: int, labels: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        scores, found = search_filtered(self.index, queries, k, labels)
+        return scores, self.rows(found)
+
+
+def _mtimes(spec: Collection) -> Tuple[float, float]:
+    return spec.index_file.stat().st_mtime, spec.meta_file.stat().st_mtime
+
+
+def _read_index(index_file: Path) -> Any:
+    import faiss
+
+    if mmap_enabled_from_env():
+        try:
+            return faiss.read_index(str(index_file), faiss.IO_FLAG_MMAP)
+        except RuntimeError:
+            pass
+    return faiss.read_index(str(index_file))
+
+
+class VectorStoreRegistry:
+    def __init__(self, max_bytes: Optional[int] = None) -> None:
+        self.max_bytes = max_bytes_from_env() if max_bytes is None else max_bytes
+        self._specs: Dict[Tuple[str, str], Collection] = {}
+        self._loaded: "OrderedDict[Tuple[str, str], LoadedCollection]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._hits = 0
+        self._evictions = 0
+
+    def register(
+        self,
+        name: str,
+        index_file: Path,
+        meta_file: Path,
+        corpus: Optional[str] = None,
+        id_col: Optional[str] = None,
+    ) -> Collection:
+        spec = Collection(
+            name, corpus or corpus_name_from_env(), index_file, meta_file, id_col
+        )
+        key = (spec.corpus, name)
+        with self._lock:
+            if self._specs.get(key) != spec:
+                self._loaded.pop(key, None)
+            self._specs[key] = spec
+        return spec
+
+    def spec(self, name: str, corpus: Optional[str] = None) -> Collection:
+        key = (corpus or corpus_name_from_env(), name)
+        if key not in self._specs:
+            raise KeyError(
+                f"Collection '{name}' für Korpus '{key[0]}' nicht registriert."
+            )
+        return self._specs[key]
+
+    def get(self, name: str, corpus: Optional[str] = None) -> LoadedCollection:
+        spec = self.spec(name, corpus)
+        key = (spec.corpus, name)
+        with self._lock:
+            loaded = self._loaded.get(key)
+            if loaded is not None and loaded.mtimes == _mtimes(spec):
+                self._loaded.move_to_end(key)
+                self._hits += 1
+                return loaded
+            start = time.perf_counter()
+            loaded = LoadedCollection(
+                spec,
+                configure_search(_read_index(spec.index_file)),
+                pd.read_parquet(spec.meta_file),
+            )
+            self._loaded[key] = loaded
+            self._loads += 1
+            print(
+                f"ℹ️ Collection {spec.corpus}/{name} geladen "
+                f"({loaded.index.ntotal} Vektoren, {time.perf_counter() - start:.2f}s)"
+            )
+            self._evict(keep=key)
+            return loaded
+
+    def _evict(self, keep: Tuple[str, str]) -> None:
+        while len(self._loaded) > 1 and self.resident_bytes() > self.max_bytes:
+            key = next(iter(self._loaded))
+            if key == keep:
+                break
+            self._loaded.pop(key)
+            self._evictions += 1
+
+    def evict(self, name: Optional[str] = None, corpus: Optional[str] = None) -> None:
+        with self._lock:
+            for key in list(self._loaded):
+                if name is None or key == (corpus or corpus_name_from_env(), name):
+                    self._loaded.pop(key)
+
+    def resident_bytes(self) -> int:
+        return sum(loaded.nbytes for loaded in self._loaded.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "resident": ["/".join(key) for key in self._loaded],
+                "resident_mb": self.resident_bytes() / 1024 / 1024,
+                "max_mb": self.max_bytes / 1024 / 1024,
+                "loads": self._loads,
+                "hits": self._hits,
+                "evictions": self._evictions,
+            }
+
+
+_REGISTRY: Optional[VectorStoreRegistry] = None
+
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_default_collections(
+    registry: VectorStoreRegistry, paths: PipelinePaths
+) -> None:
+    index_dir = paths.embeddings_index_dir
+    registry.register(
+        "premises",
+        index_dir / "premises.faiss",
+        index_dir / "premises_meta.parquet",
+        id_col="premise_id",
+    )
+    registry.register(
+        "risks",
+        index_dir / "risks.faiss",
+        index_dir / "risks_meta.parquet",
+        id_col="risk_id",
+    )
+
+
+def get_registry() -> VectorStoreRegistry:
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = VectorStoreRegistry()
+            register_default_collections(
+                _REGISTRY, PipelinePaths.from_file(Path(__file__))
+            )
+    return _REGISTRY
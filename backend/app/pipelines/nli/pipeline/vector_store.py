@@ -0,0 +1,376 @@
+from __future__ import annotations
+import json
+import math
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from token_sidecar import text_sha
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STORE_DTYPES = {"float16", "float32"}
+
+FAISS_ID_COLUMN = "faiss_id"
+
+INDEX_SPECS = {"flat", "ivf", "hnsw", "ivfpq", "sq8"}
+
+DEFAULT_NPROBE = 16
+
+DEFAULT_EF_SEARCH = 64
+
+MIN_TRAIN_PER_LIST = 39
+
+PQ_MIN_TRAIN = 256
+
+
+def store_dtype_from_env() -> str:
+    dtype = os.getenv("EMBED_STORE_DTYPE", "float32").strip().lower()
+    return dtype if dtype in STORE_DTYPES else "float32"
+
+
+def index_spec_from_env() -> str:
+    return os.getenv("EMBED_INDEX_SPEC", "flat").strip() or "flat"
+
+
+def _int_from_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _pq_subquantizers(dim: int) -> int:
+    return next(
+        (
+            m
+            for m in (64, 48, 32, 24, 16, 12, 8, 4, 2)
+            if dim % m == 0 and dim // m >= 8
+        ),
+        1,
+    )
+
+
+def factory_string(spec: str, count: int, dim: int) -> str:
+    name = spec.strip().lower()
+    nlist = max(1, min(int(4 * math.sqrt(count)), count // MIN_TRAIN_PER_LIST))
+    if name == "flat" or (name == "ivfpq" and count < PQ_MIN_TRAIN):
+        return "Flat"
+    if name == "ivf":
+        return f"IVF{nlist},Flat"
+    if name == "hnsw":
+        return "HNSW32"
+    if name == "ivfpq":
+        return f"IVF{nlist},PQ{_pq_subquantizers(dim)}"
+    if name == "sq8":
+        return "SQ8"
+    return spec.strip()
+
+
+def build_ann_index(vectors: np.ndarray, spec: Optional[str] = None) -> Any:
+    import faiss
+
+    description = factory_string(
+        spec or index_spec_from_env(), len(vectors), vectors.shape[1]
+    )
+    index = faiss.index_factory(
+        vectors.shape[1], description, faiss.METRIC_INNER_PRODUCT
+    )
+    if not index.is_trained:
+        index.train(vectors)
+    return index
+
+
+def configure_search(
+    index: Any, nprobe: Optional[int] = None, ef_search: Optional[int] = None
+) -> Any:
+    import faiss
+
+    base = faiss.downcast_index(index.index) if _is_id_map(index) else index
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None:
+        ivf.nprobe = min(
+            ivf.nlist, nprobe or _int_from_env("EMBED_INDEX_NPROBE", DEFAULT_NPROBE)
+        )
+    if hasattr(base, "hnsw"):
+        base.hnsw.efSearch = ef_search or _int_from_env(
+            "EMBED_INDEX_EF_SEARCH", DEFAULT_EF_SEARCH
+        )
+    return index
+
+
+def filter_labels(meta: "pd.DataFrame", mask: np.ndarray) -> np.ndarray:
+    if FAISS_ID_COLUMN in meta.columns:
+        return meta[FAISS_ID_COLUMN].to_numpy(dtype=np.int64)[mask]
+    return np.flatnonzero(mask).astype(np.int64)
+
+
+def search_filtered(
+    index: Any, queries: np.ndarray, k: int, labels: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    import faiss
+
+    if labels is None:
+        return index.search(queries, k)
+    if not len(labels):
+        return (
+            np.full((len(queries), k), -np.inf, dtype="float32"),
+            np.full((len(queries), k), -1, dtype=np.int64),
+        )
+    selector = faiss.IDSelectorBatch(labels)
+    base = faiss.downcast_index(index.index) if _is_id_map(index) else index
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None:
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    elif hasattr(base, "hnsw"):
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=base.hnsw.efSearch)
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    return index.search(queries, k, params=params)
+
+
+def vector_sidecar_paths(index_file: Path) -> Tuple[Path, Path]:
+    return (
+        index_file.with_name(f"{index_file.stem}.vectors.npy"),
+        index_file.with_name(f"{index_file.stem}.vectors.json"),
+    )
+
+
+def write_vector_sidecar(
+    index_file: Path,
+    ids: Sequence[str],
+    vectors: np.ndarray,
+    model: str,
+    dtype: Optional[str] = None,
+    text_shas: Optional[Sequence[str]] = None,
+    faiss_ids: Optional[Sequence[int]] = None,
+    index_spec: Optional[str] = None,
+) -> Path:
+    dtype = dtype or store_dtype_from_env()
+    vectors_file, manifest_file = vector_sidecar_paths(index_file)
+    np.save(vectors_file, np.asarray(vectors).astype(dtype))
+    manifest: Dict[str, Any] = {
+        "model": model,
+        "dims": int(vectors.shape[1]),
+        "dtype": dtype,
+        "count": int(vectors.shape[0]),
+        "ids": [str(item) for item in ids],
+    }
+    if text_shas is not None:
+        manifest["text_sha"] = list(text_shas)
+    if faiss_ids is not None:
+        manifest["faiss_ids"] = [int(fid) for fid in faiss_ids]
+    if index_spec is not None:
+        manifest["index_spec"] = index_spec
+    manifest_file.write_text(json.dumps(manifest), encoding="utf-8")
+    return vectors_file
+
+
+def load_vector_sidecar(
+    index_file: Path,
+) -> Optional[Tuple[Dict[str, Any], np.ndarray]]:
+    vectors_file, manifest_file = vector_sidecar_paths(index_file)
+    if not vectors_file.exists() or not manifest_file.exists():
+        return None
+    if (
+        index_file.exists()
+        and index_file.stat().st_mtime > vectors_file.stat().st_mtime
+    ):
+        return None
+    manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    vectors = np.load(vectors_file, mmap_mode="r")
+    if vectors.shape[0] != manifest.get("count"):
+        return None
+    return manifest, vectors
+
+
+class IndexVectors:
+    def __init__(
+        self,
+        texts: Sequence[str],
+        vectors: np.ndarray,
+        ids: Optional[Sequence[str]] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        self.vectors = vectors
+        self.model = model
+        self._rows = {text: row for row, text in enumerate(texts)}
+        self._id_rows = {str(item): row for row, item in enumerate(ids or [])}
+
+    @classmethod
+    def from_index(
+        cls, index_file: Path, meta_file: Path, text_col: str
+    ) -> "IndexVectors":
+        import pandas as pd
+
+        meta = pd.read_parquet(meta_file, columns=[text_col])
+        texts = meta[text_col].astype(str).tolist()
+        sidecar = load_vector_sidecar(index_file)
+        if sidecar is not None and len(sidecar[1]) == len(texts):
+            manifest, vectors = sidecar
+            return cls(texts, vectors, manifest.get("ids"), manifest.get("model"))
+        import faiss
+
+        index = faiss.read_index(str(index_file))
+        storage = faiss.downcast_index(index.index) if _is_id_map(index) else index
+        return cls(texts, storage.reconstruct_n(0, storage.ntotal))
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    def _gather(self, rows: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        positions = np.array(rows, dtype=np.int64)
+        found = positions >= 0
+        vectors = np.zeros((len(positions), self.dim), dtype="float32")
+        if found.any():
+            vectors[found] = self.vectors[positions[found]]
+        return vectors, found
+
+    def lookup(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        return self._gather([self._rows.get(text, -1) for text in texts])
+
+    def lookup_ids(self, ids: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        return self._gather([self._id_rows.get(str(item), -1) for item in ids])
+
+
+def stable_faiss_id(key: str) -> int:
+    return int(text_sha(key)[:15], 16)
+
+
+def _is_id_map(index: Any) -> bool:
+    return hasattr(index, "id_map")
+
+
+def _with_ids(base: Any) -> Any:
+    import faiss
+
+    if faiss.try_extract_index_ivf(base) is not None:
+        return base
+    return faiss.IndexIDMap2(base)
+
+
+def _keeps_ids(index: Any) -> bool:
+    import faiss
+
+    return _is_id_map(index) or faiss.try_extract_index_ivf(index) is not None
+
+
+def label_positions(meta: "pd.DataFrame") -> Optional[Dict[int, int]]:
+    if FAISS_ID_COLUMN not in meta.columns:
+        return None
+    return {int(fid): pos for pos, fid in enumerate(meta[FAISS_ID_COLUMN].tolist())}
+
+
+def _previous_state(
+    index_file: Path, spec: str, model: str
+) -> Tuple[Optional[Any], Dict[int, Tuple[int, str]], Optional[np.ndarray]]:
+    import faiss
+
+    sidecar = load_vector_sidecar(index_file)
+    if sidecar is None or not index_file.exists():
+        return None, {}, None
+    manifest, vectors = sidecar
+    if "faiss_ids" not in manifest or "text_sha" not in manifest:
+        return None, {}, None
+    if manifest.get("index_spec", "flat") != spec or manifest.get("model") != model:
+        return None, {}, None
+    index = faiss.read_index(str(index_file))
+    if not _keeps_ids(index) or index.ntotal != len(vectors):
+        return None, {}, None
+    rows = {
+        int(fid): (row, sha)
+        for row, (fid, sha) in enumerate(
+            zip(manifest["faiss_ids"], manifest["text_sha"])
+        )
+    }
+    return index, rows, vectors
+
+
+def update_index(
+    index_file: Path,
+    meta_file: Path,
+    meta: "pd.DataFrame",
+    id_col: str,
+    text_col: str,
+    embed: Callable[[List[str]], np.ndarray],
+    model: str,
+    full: bool = False,
+    spec: Optional[str] = None,
+) -> Dict[str, int]:
+    import faiss
+
+    spec = spec or index_spec_from_env()
+
+    meta = meta.reset_index(drop=True).copy()
+    ids = meta[id_col].astype(str).tolist()
+    texts = meta[text_col].astype(str).tolist()
+    if not texts:
+        raise ValueError(f"Keine Texte für {index_file.name}.")
+    shas = [text_sha(text) for text in texts]
+    unique_ids = len(set(ids)) == len(ids)
+    keys = ids if unique_ids else [f"{i}#{s}" for i, s in zip(ids, shas)]
+    fids = np.array([stable_faiss_id(key) for key in keys], dtype=np.int64)
+    index, previous, stored = (
+        (None, {}, None) if full else _previous_state(index_file, spec, model)
+    )
+    reuse = [
+        pos
+        for pos, fid in enumerate(fids.tolist())
+        if fid in previous and previous[fid][1] == shas[pos]
+    ]
+    reused = set(reuse)
+    fresh = [pos for pos in range(len(texts)) if pos not in reused]
+    changed = [int(fids[pos]) for pos in fresh if int(fids[pos]) in previous]
+    current = set(fids.tolist())
+    dropped = [fid for fid in previous if fid not in current]
+    vectors: Optional[np.ndarray] = None
+    if fresh:
+        embedded = np.asarray(embed([texts[pos] for pos in fresh]), dtype="float32")
+        if stored is not None and embedded.shape[1] != stored.shape[1]:
+            return update_index(
+                index_file, meta_file, meta, id_col, text_col, embed, model, True, spec
+            )
+        if len(fresh) == len(texts):
+            vectors = embedded
+        else:
+            vectors = np.zeros((len(texts), embedded.shape[1]), dtype="float32")
+            vectors[fresh] = embedded
+    if reuse:
+        if vectors is None:
+            vectors = np.zeros((len(texts), stored.shape[1]), dtype="float32")
+        vectors[reuse] = stored[[previous[int(fids[pos])][0] for pos in reuse]]
+    if index is not None and (dropped or changed):
+        try:
+            index.remove_ids(np.array(dropped + changed, dtype=np.int64))
+        except RuntimeError:
+            index = None
+    if index is None:
+        index = _with_ids(build_ann_index(vectors, spec))
+        index.add_with_ids(vectors, fids)
+    elif fresh:
+        index.add_with_ids(vectors[fresh], fids[fresh])
+    order_ids = faiss.vector_to_array(index.id_map) if _is_id_map(index) else fids
+    position = {int(fid): pos for pos, fid in enumerate(fids.tolist())}
+    order = [position[int(fid)] for fid in order_ids]
+    meta = meta.iloc[order].reset_index(drop=True)
+    meta[FAISS_ID_COLUMN] = order_ids
+    faiss.write_index(index, str(index_file))
+    meta.to_parquet(meta_file, index=False)
+    write_vector_sidecar(
+        index_file,
+        [ids[pos] for pos in order],
+        vectors[order],
+        model,
+        text_shas=[shas[pos] for pos in order],
+        faiss_ids=order_ids.tolist(),
+        index_spec=spec,
+    )
+    return {
+        "rows": len(texts),
+        "embedded": len(fresh),
+        "reused": len(reuse),
+        "changed": len(changed),
+        "removed": len(dropped),
+    }
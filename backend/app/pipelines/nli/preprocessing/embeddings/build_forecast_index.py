@@ -1,18 +1,16 @@
 from __future__ import annotations
+import argparse
+import shutil
 from pathlib import Path
 from os import getenv
 import sys
 from typing import List
-import faiss
 import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
-from openai import OpenAI
 
 load_dotenv()
 
-client = OpenAI(api_key=getenv("OPENAI_API_KEY"))
-
 BASE_DIR = Path(__file__).resolve().parent
 
 
@@ -36,7 +34,10 @@ PIPELINE_ROOT = NLI_ROOT / "pipeline"
 if str(PIPELINE_ROOT) not in sys.path:
     sys.path.insert(0, str(PIPELINE_ROOT))
 
+from embedding_providers import get_embedding_provider
 from paths import PipelinePaths
+from query_embeddings import cached_embeddings
+from vector_store import index_spec_from_env, update_index
 
 PATHS = PipelinePaths.from_file(Path(__file__))
 
@@ -48,13 +49,17 @@ INDEX_DIR = PATHS.embeddings_index_dir
 
 INDEX_FILE = INDEX_DIR / "premises.faiss"
 
+CHECKPOINT_DIR = INDEX_DIR / ".premises-checkpoint"
+
 META_FILE = INDEX_DIR / "premises_meta.parquet"
 
 TEXT_COL = "premise_text"
 
 ID_COL = "premise_id"
 
-EMBEDDING_MODEL = "text-embedding-3-small"
+embedder = get_embedding_provider()
+
+FILTER_COLS = ["segment", "region"]
 
 
 def load_premises(path: Path) -> pd.DataFrame:
@@ -77,30 +82,25 @@ def load_premises(path: Path) -> pd.DataFrame:
     return df
 
 
-def embed_batch(texts: List[str]) -> np.ndarray:
-    resp = client.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=texts,
-    )
-    vectors = [np.array(item.embedding, dtype="float32") for item in resp.data]
-    return np.vstack(vectors)
-
-
 def build_embeddings(texts: List[str], batch_size: int = 64) -> np.ndarray:
-    all_vecs: List[np.ndarray] = []
-    for start in range(0, len(texts), batch_size):
-        end = start + batch_size
-        batch = texts[start:end]
-        print(f"➡️ Embedding Batch {start}–{end-1} ({len(batch)} Texte)…")
-        vecs = embed_batch(batch)
-        all_vecs.append(vecs)
-    emb = np.vstack(all_vecs)
-    norms = np.linalg.norm(emb, axis=1, keepdims=True) + 1e-12
-    emb = emb / norms
-    return emb.astype("float32")
+    return cached_embeddings(embedder, texts, batch_size, CHECKPOINT_DIR)
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or update the FAISS index")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        default=getenv("EMBED_INDEX_FULL", "false").strip().lower()
+        in {"1", "true", "yes"},
+        help="Re-embed and rebuild every row",
+    )
+    parser.add_argument(
+        "--index-spec",
+        default=index_spec_from_env(),
+        help="flat, ivf, hnsw, ivfpq, sq8 or a faiss index_factory string",
+    )
+    args = parser.parse_args()
     print(f"➡️ Lade forecasts-statista (Statista + curated) aus {MERGED_PREMISES}")
     if CURATED_FORECASTS.exists():
         print(f"ℹ️ Curated forecasts eingebunden aus {CURATED_FORECASTS}")
@@ -111,20 +111,31 @@ def main() -> None:
     if "kind" in df.columns:
         kind_counts = df["kind"].fillna("unknown").value_counts().to_dict()
         print(f"   Breakdown by kind: {kind_counts}")
-    texts = df[TEXT_COL].astype(str).tolist()
     INDEX_DIR.mkdir(parents=True, exist_ok=True)
-    print(f"➡️ Baue OpenAI-Embeddings mit {EMBEDDING_MODEL} …")
-    emb = build_embeddings(texts, batch_size=64)
-    d = emb.shape[1]
-    print(f"➡️ Erzeuge FAISS IndexFlatIP mit Dimension {d}")
-    index = faiss.IndexFlatIP(d)
-    index.add(emb)
-    print(f"➡️ Speichere Index → {INDEX_FILE}")
-    faiss.write_index(index, str(INDEX_FILE))
-    print(f"➡️ Speichere Meta-Daten → {META_FILE}")
-    meta = df[[ID_COL, TEXT_COL]].copy()
-    meta.to_parquet(META_FILE, index=False)
-    print(f"✅ Fertig: {len(df)} forecasts-statista im Index.")
+    filter_cols = [col for col in FILTER_COLS if col in df.columns]
+    meta = df[[ID_COL, TEXT_COL, *filter_cols]].copy()
+    mode = "Neuaufbau" if args.full else "inkrementell"
+    print(
+        f"➡️ Aktualisiere FAISS-Index ({mode}, {args.index_spec}, {embedder.name}:{embedder.model}) "
+        f"→ {INDEX_FILE}"
+    )
+    stats = update_index(
+        INDEX_FILE,
+        META_FILE,
+        meta,
+        ID_COL,
+        TEXT_COL,
+        build_embeddings,
+        embedder.cache_key,
+        full=args.full,
+        spec=args.index_spec,
+    )
+    shutil.rmtree(CHECKPOINT_DIR, ignore_errors=True)
+    print(
+        f"ℹ️ {stats['embedded']} eingebettet ({stats['changed']} geändert), "
+        f"{stats['reused']} wiederverwendet, {stats['removed']} entfernt"
+    )
+    print(f"✅ Fertig: {stats['rows']} forecasts-statista im Index.")
 
 
 if __name__ == "__main__":
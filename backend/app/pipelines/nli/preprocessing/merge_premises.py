@@ -28,6 +28,7 @@ if str(PIPELINE_ROOT) not in sys.path:
     sys.path.insert(0, str(PIPELINE_ROOT))
 
 from paths import PipelinePaths
+from token_sidecar import write_token_sidecar
 
 PATHS = PipelinePaths.from_file(Path(__file__))
 
@@ -123,6 +124,7 @@ def merge_premises(target: Path) -> None:
     target.parent.mkdir(parents=True, exist_ok=True)
     df.to_parquet(target, index=False)
     print(f"[ok] merged {len(df)} forecasts-statista corpus rows → {target}")
+    write_token_sidecar(df, target, ["premise_text"])
 
 
 def main():
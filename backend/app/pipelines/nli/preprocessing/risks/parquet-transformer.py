@@ -22,6 +22,7 @@ if str(PIPELINE_ROOT) not in sys.path:
     sys.path.insert(0, str(PIPELINE_ROOT))
 
 from paths import PipelinePaths
+from token_sidecar import write_token_sidecar
 
 PATHS = PipelinePaths.from_file(Path(__file__))
 
@@ -55,6 +56,7 @@ def main() -> None:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     df.to_parquet(OUT_PARQUET, index=False)
     print(f"✅ {len(df)} Zeilen nach {OUT_PARQUET} geschrieben")
+    write_token_sidecar(df, OUT_PARQUET, ["nli", "risk_text_quote", "risk_name"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+import pytest
+
+PIPELINE_ROOT = Path(__file__).resolve().parents[1] / "pipelines" / "nli" / "pipeline"
+
+PAIRS_DIR = PIPELINE_ROOT / "4-PremisePairs"
+
+for path in (PIPELINE_ROOT, PAIRS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from shared.nli_cache import CachedNliScorer, NliResultCache, cache_key
+from shared.nli_scoring import NliScorer, ScoreDict, ScorePair
+
+
+class CountingScorer(NliScorer):
+    def __init__(self) -> None:
+        super().__init__(model_name="fake-nli", backend="fake")
+        self.scored: List[ScorePair] = []
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        self.scored.append((premise, hypothesis))
+        entailment = (len(premise) % 10) / 10
+        return {
+            "CONTRADICTION": 0.0,
+            "ENTAILMENT": entailment,
+            "NEUTRAL": 1 - entailment,
+        }
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        return [self.score(premise, hypothesis) for premise, hypothesis in pairs]
+
+
+def _scores(value: float) -> ScoreDict:
+    return {"CONTRADICTION": 0.0, "ENTAILMENT": value, "NEUTRAL": 1 - value}
+
+
+@pytest.fixture()
+def cache(tmp_path: Path) -> NliResultCache:
+    return NliResultCache(tmp_path / "nli_cache.sqlite", max_entries=3)
+
+
+def test_cache_round_trip(cache: NliResultCache) -> None:
+    key = cache_key("fake-nli", "premise", "hypothesis")
+    other = cache_key("fake-nli", "premise", "other")
+    cache.put_many([(key, _scores(0.25))])
+    assert cache.get_many([key, other, key]) == [_scores(0.25), None, _scores(0.25)]
+
+
+def test_cache_evicts_least_recently_used(cache: NliResultCache) -> None:
+    keys = [cache_key("fake-nli", f"premise {i}", "hypothesis") for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        cache.put_many([(key, _scores(i / 10))])
+    assert cache.get_many([keys[0]]) == [_scores(0.0)]
+    cache.put_many([(keys[3], _scores(0.3))])
+    assert len(cache) == 3
+    assert cache.get_many(keys) == [_scores(0.0), None, _scores(0.2), _scores(0.3)]
+
+
+def test_cached_scorer_counts_hits_and_misses(tmp_path: Path) -> None:
+    inner = CountingScorer()
+    scorer = CachedNliScorer(inner, NliResultCache(tmp_path / "nli_cache.sqlite"))
+    pairs = [("p1", "h"), ("p2", "h"), ("p1", "h")]
+    first = scorer.score_batch(pairs)
+    assert inner.scored == [("p1", "h"), ("p2", "h")]
+    assert (scorer.hits, scorer.misses) == (0, 3)
+    second = scorer.score_batch(pairs + [("p3", "h")])
+    assert second[:3] == first
+    assert inner.scored[-1] == ("p3", "h") and len(inner.scored) == 3
+    stats = scorer.stats()
+    assert (stats["cache_hits"], stats["cache_misses"]) == (3, 4)
+    assert stats["cache_hit_rate"] == pytest.approx(3 / 7)
+
+
+def test_cache_is_namespaced_by_model(tmp_path: Path) -> None:
+    cache = NliResultCache(tmp_path / "nli_cache.sqlite")
+    cache.put_many([(cache_key("model-a", "p", "h"), _scores(0.5))])
+    assert cache.get_many([cache_key("model-b", "p", "h")]) == [None]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+import pytest
+
+PIPELINE_ROOT = Path(__file__).resolve().parents[1] / "pipelines" / "nli" / "pipeline"
+
+PAIRS_DIR = PIPELINE_ROOT / "4-PremisePairs"
+
+for path in (PIPELINE_ROOT, PAIRS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from shared import nli_deadline
+from shared.nli_deadline import Deadline, score_anytime
+from shared.nli_scoring import NliScorer, ScoreDict, ScorePair
+
+SECONDS_PER_PAIR = 1.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class SlowScorer(NliScorer):
+    def __init__(self, clock: FakeClock) -> None:
+        super().__init__(model_name="fake-nli", backend="fake")
+        self.clock = clock
+        self.batches: List[List[ScorePair]] = []
+
+    def score(self, premise: str, hypothesis: str) -> ScoreDict:
+        return self.score_batch([(premise, hypothesis)])[0]
+
+    def score_batch(
+        self, pairs: Sequence[ScorePair], batch_size: Optional[int] = None
+    ) -> List[ScoreDict]:
+        self.batches.append(list(pairs))
+        self.clock.now += SECONDS_PER_PAIR * len(pairs)
+        return [{"CONTRADICTION": 0.0, "ENTAILMENT": 1.0, "NEUTRAL": 0.0}] * len(pairs)
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(nli_deadline, "time", fake)
+    return fake
+
+
+PAIRS = [(f"premise {i}", "hypothesis") for i in range(6)]
+
+PRIORITIES = [0.1, 0.9, 0.5, 0.3, 0.8, 0.2]
+
+
+def test_without_deadline_every_pair_is_scored(clock: FakeClock) -> None:
+    results, stats = score_anytime(
+        SlowScorer(clock), PAIRS, PRIORITIES, Deadline(), chunk_size=2
+    )
+    assert all(row is not None for row in results)
+    assert stats["deadline_hit"] is False
+    assert stats["unscored_pairs"] == 0
+
+
+def test_deadline_keeps_best_first_results(clock: FakeClock) -> None:
+    scorer = SlowScorer(clock)
+    deadline = Deadline(clock.now + 3.5)
+    results, stats = score_anytime(scorer, PAIRS, PRIORITIES, deadline, chunk_size=2)
+    assert scorer.batches[0] == [PAIRS[1], PAIRS[4]]
+    assert stats["deadline_hit"] is True
+    assert stats["time_budget_seconds"] == pytest.approx(3.5)
+    assert stats["scored_pairs"] == 3
+    assert [idx for idx, row in enumerate(results) if row is not None] == [1, 2, 4]
+
+
+def test_expired_deadline_scores_nothing(clock: FakeClock) -> None:
+    scorer = SlowScorer(clock)
+    results, stats = score_anytime(
+        scorer, PAIRS, PRIORITIES, Deadline(clock.now - 1), chunk_size=2
+    )
+    assert scorer.batches == []
+    assert results == [None] * len(PAIRS)
+    assert stats["deadline_hit"] is True
+    assert stats["unscored_pairs"] == len(PAIRS)
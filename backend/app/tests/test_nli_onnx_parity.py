@@ -0,0 +1,42 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+import pytest
+
+pytest.importorskip("onnxruntime")
+
+PIPELINE_ROOT = Path(__file__).resolve().parents[1] / "pipelines" / "nli" / "pipeline"
+
+PAIRS_DIR = PIPELINE_ROOT / "4-PremisePairs"
+
+for path in (PIPELINE_ROOT, PAIRS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nli_onnx_export import check_parity
+from shared.nli_onnx import ONNX_FILE_NAME, onnx_export_dir
+from shared.nli_reference import LABELS, REFERENCE_PAIRS
+from shared.nli_scoring import model_name_from_env
+
+TOLERANCE = 1e-3
+
+
+@pytest.fixture(scope="module")
+def parity_report() -> dict:
+    model_name = model_name_from_env()
+    export_dir = onnx_export_dir(model_name)
+    if not (export_dir / ONNX_FILE_NAME).exists():
+        pytest.skip(f"ONNX export missing: {export_dir} (make nli-onnx-export)")
+    return check_parity(model_name, export_dir, TOLERANCE)
+
+
+@pytest.mark.integration
+def test_onnx_probabilities_match_torch(parity_report: dict) -> None:
+    assert parity_report["pair_count"] == len(REFERENCE_PAIRS)
+    for label in LABELS:
+        assert parity_report["max_abs_diff"][label] <= TOLERANCE, label
+
+
+@pytest.mark.integration
+def test_onnx_verdicts_match_torch(parity_report: dict) -> None:
+    assert parity_report["label_agreement"] == 1.0
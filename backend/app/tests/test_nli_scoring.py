@@ -0,0 +1,49 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+PIPELINE_ROOT = Path(__file__).resolve().parents[1] / "pipelines" / "nli" / "pipeline"
+
+PAIRS_DIR = PIPELINE_ROOT / "4-PremisePairs"
+
+for path in (PIPELINE_ROOT, PAIRS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from shared.nli_scoring import plan_length_buckets
+
+LENGTHS = [12, 3, 40, 7, 7, 25, 3, 18, 60, 1]
+
+
+def test_buckets_cover_every_pair_once() -> None:
+    buckets = plan_length_buckets(LENGTHS, 4)
+    flat = [idx for bucket in buckets for idx in bucket]
+    assert sorted(flat) == list(range(len(LENGTHS)))
+
+
+def test_buckets_are_ordered_by_length() -> None:
+    buckets = plan_length_buckets(LENGTHS, 4)
+    flat = [LENGTHS[idx] for bucket in buckets for idx in bucket]
+    assert flat == sorted(LENGTHS)
+
+
+def test_buckets_respect_batch_size() -> None:
+    buckets = plan_length_buckets(LENGTHS, 4)
+    assert [len(bucket) for bucket in buckets] == [4, 4, 2]
+    assert all(len(bucket) == 1 for bucket in plan_length_buckets(LENGTHS, 0))
+
+
+def test_bucketing_reduces_padding() -> None:
+    buckets = plan_length_buckets(LENGTHS, 4)
+    padded = sum(
+        max(LENGTHS[idx] for idx in bucket) * len(bucket) for bucket in buckets
+    )
+    naive = sum(
+        max(LENGTHS[start : start + 4]) * len(LENGTHS[start : start + 4])
+        for start in range(0, len(LENGTHS), 4)
+    )
+    assert padded < naive
+
+
+def test_empty_input_has_no_buckets() -> None:
+    assert plan_length_buckets([], 8) == []
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+PIPELINE_ROOT = Path(__file__).resolve().parents[1] / "pipelines" / "nli" / "pipeline"
+
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+from embedding_providers import HashingEmbeddingProvider
+from vector_store import FAISS_ID_COLUMN, IndexVectors, update_index
+
+DIMS = 64
+
+
+class CountingEmbedder:
+    def __init__(self) -> None:
+        self.provider = HashingEmbeddingProvider("hashing-v1", DIMS)
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return self.provider.embed(texts)
+
+
+def _corpus(texts: dict[str, str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"premise_id": list(texts), "premise_text": list(texts.values())}
+    )
+
+
+CORPUS = {
+    "p1": "Revenue in China grew by eight percent.",
+    "p2": "Wearables shipments declined in Europe.",
+    "p3": "Services margin expanded year over year.",
+    "p4": "Supply constraints weighed on iPhone sales.",
+}
+
+
+@pytest.fixture()
+def index_files(tmp_path: Path) -> tuple[Path, Path]:
+    return tmp_path / "premises.faiss", tmp_path / "premises_meta.parquet"
+
+
+def _update(
+    files: tuple[Path, Path], corpus: dict[str, str], embed: CountingEmbedder
+) -> dict[str, int]:
+    index_file, meta_file = files
+    return update_index(
+        index_file,
+        meta_file,
+        _corpus(corpus),
+        "premise_id",
+        "premise_text",
+        embed,
+        "hash-hashing-v1",
+        spec="flat",
+    )
+
+
+def test_unchanged_corpus_is_not_re_embedded(index_files: tuple[Path, Path]) -> None:
+    embed = CountingEmbedder()
+    first = _update(index_files, CORPUS, embed)
+    assert first["embedded"] == 4
+    second = _update(index_files, CORPUS, embed)
+    assert second == {
+        "rows": 4,
+        "embedded": 0,
+        "reused": 4,
+        "changed": 0,
+        "removed": 0,
+    }
+    assert len(embed.calls) == 1
+
+
+def test_only_changed_rows_are_embedded(index_files: tuple[Path, Path]) -> None:
+    embed = CountingEmbedder()
+    _update(index_files, CORPUS, embed)
+    corpus = dict(CORPUS)
+    corpus["p2"] = "Wearables shipments recovered in Europe."
+    del corpus["p3"]
+    corpus["p5"] = "Mac revenue stabilised after the refresh."
+    stats = _update(index_files, corpus, embed)
+    assert stats == {"rows": 4, "embedded": 2, "reused": 2, "changed": 1, "removed": 1}
+    assert sorted(embed.calls[-1]) == sorted([corpus["p2"], corpus["p5"]])
+
+    index_file, meta_file = index_files
+    index = faiss.read_index(str(index_file))
+    meta = pd.read_parquet(meta_file)
+    assert index.ntotal == len(corpus)
+    assert set(meta["premise_id"]) == set(corpus)
+    assert list(meta[FAISS_ID_COLUMN]) == list(faiss.vector_to_array(index.id_map))
+
+    vectors = IndexVectors.from_index(index_file, meta_file, "premise_text")
+    stored, found = vectors.lookup(list(corpus.values()))
+    assert found.all()
+    np.testing.assert_allclose(
+        stored, embed.provider.embed(list(corpus.values())), atol=1e-6
+    )
+
+
+def test_search_returns_updated_rows(index_files: tuple[Path, Path]) -> None:
+    embed = CountingEmbedder()
+    _update(index_files, CORPUS, embed)
+    corpus = dict(CORPUS, p2="Wearables shipments recovered in Europe.")
+    _update(index_files, corpus, embed)
+    index_file, meta_file = index_files
+    index = faiss.read_index(str(index_file))
+    meta = pd.read_parquet(meta_file)
+    _, labels = index.search(embed.provider.embed([corpus["p2"]]), 1)
+    hit = meta.loc[meta[FAISS_ID_COLUMN] == labels[0][0], "premise_id"]
+    assert hit.tolist() == ["p2"]